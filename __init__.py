@@ -12,12 +12,27 @@
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 """
 
-from typing import Optional, Dict
+import functools
+import json
+import logging
+import math
+import os
+import re
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from string import Template
+from typing import Any, Optional, Dict, Iterable, Iterator, List, Set, Tuple
 from aqt import gui_hooks, mw
 from aqt.qt import (
-    QMenuBar, QMenu, QWidget, qtmajor, QTimer, QApplication, sip
+    QMenuBar, QMenu, QWidget, qtmajor, QTimer, QApplication, sip,
+    QAction, QDialog, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QCheckBox,
+    QPushButton, QFileSystemWatcher, QFontDatabase
 )
+from aqt.deckbrowser import DeckBrowser
 from aqt.theme import theme_manager
+from aqt.utils import tooltip
 from aqt.webview import AnkiWebView
 import aqt.colors
 
@@ -101,10 +116,475 @@ WASHI_COLORS_DARK = {
     "info": "#7BA3D1",
 }
 
+# ═══════════════════════════════════════════════════════════════════════════════
+#   PALETTE ENGINE — 调色板生成
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# 默认种子色（与上方手调色板一致）
+DEFAULT_SEEDS = {"accent": "#C73E3A", "paper": "#FAF7F2", "ink": "#1A1A1A"}
+
+# 令牌配方：令牌 → 浅色 / 深色各一组 (来源种子, 固定色相, L, C)
+#   来源为 paper / ink / accent 时，C 是相对种子色度的倍数，色相沿用种子；
+#   来源为 fixed 时，C 是相对强调色色度的倍数，色相取固定值。
+#   L 为 None 表示沿用种子亮度。
+_TOKEN_RECIPES = (
+    ("paper_primary",   ("paper", None, None, 1.00),   ("paper", None, 0.211, 0.68)),
+    ("paper_secondary", ("paper", None, 0.942, 1.62),  ("paper", None, 0.247, 1.30)),
+    ("paper_elevated",  ("paper", None, 1.000, 0.00),  ("paper", None, 0.280, 1.26)),
+    ("ink_primary",     ("ink", None, None, 1.00),     ("paper", None, 0.958, 1.16)),
+    ("ink_secondary",   ("ink", None, 0.409, 1.00),    ("paper", None, 0.805, 1.46)),
+    ("ink_tertiary",    ("paper", None, 0.623, 1.45),  ("paper", None, 0.623, 1.45)),
+    ("ink_faint",       ("paper", None, 0.805, 1.46),  ("paper", None, 0.397, 1.16)),
+    ("vermilion",       ("accent", None, None, 1.00),  ("accent", None, 0.673, 0.92)),
+    ("vermilion_soft",  ("accent", None, 0.783, 0.47), ("accent", None, 0.783, 0.55)),
+    ("vermilion_pale",  ("accent", None, 0.936, 0.095), ("accent", None, 0.321, 0.118)),
+    ("indigo",          ("fixed", 250.0, 0.418, 0.377), ("fixed", 252.0, 0.704, 0.464)),
+    ("matcha",          ("fixed", 133.0, 0.615, 0.269), ("fixed", 137.0, 0.744, 0.297)),
+    ("gold",            ("fixed", 59.0, 0.700, 0.304),  ("fixed", 65.0, 0.800, 0.275)),
+    ("success",         ("fixed", 157.0, 0.594, 0.394), ("fixed", 137.0, 0.744, 0.297)),
+    ("warning",         ("fixed", 80.0, 0.743, 0.500),  ("fixed", 65.0, 0.800, 0.275)),
+    ("error",           ("accent", None, None, 1.00),  ("accent", None, 0.673, 0.92)),
+    ("info",            ("fixed", 250.0, 0.569, 0.359), ("fixed", 252.0, 0.704, 0.464)),
+)
+
+# 结构色：(令牌, 浅色不透明度, 深色不透明度)；边框取主墨色，深色阴影取纯黑
+_ALPHA_TOKENS = (
+    ("border_subtle", 0.08, 0.08),
+    ("border_medium", 0.12, 0.12),
+    ("border_strong", 0.18, 0.18),
+    ("shadow_soft", 0.04, 0.20),
+    ("shadow_medium", 0.08, 0.30),
+    ("shadow_strong", 0.12, 0.40),
+)
+
+# WCAG 对比度要求：(前景, 背景, 最低对比度)；非令牌名按颜色字面值处理
+CONTRAST_REQUIREMENTS = (
+    ("ink_primary", "paper_primary", 7.0),
+    ("ink_primary", "paper_elevated", 7.0),
+    ("ink_secondary", "paper_primary", 4.5),
+    ("ink_tertiary", "paper_primary", 3.0),
+    ("vermilion", "paper_primary", 3.0),
+    ("vermilion", "vermilion_pale", 3.0),
+    ("#FFFFFF", "vermilion", 3.0),
+)
+
+# 色域映射时二分收缩色度的次数
+_GAMUT_STEPS = 8
+
+def _normalize_hex(color: str) -> str:
+    """#RGB / #RRGGBB → #RRGGBB（大写），其他格式抛出 ValueError"""
+    value = color.strip().lstrip('#')
+    if len(value) == 3:
+        value = "".join(c * 2 for c in value)
+    if len(value) != 6 or not all(c in "0123456789abcdefABCDEF" for c in value):
+        raise ValueError(f"not a #RGB or #RRGGBB color: {color!r}")
+    return "#" + value.upper()
+
+def _hex_to_linear(color: str) -> Tuple[float, float, float]:
+    value = _normalize_hex(color).lstrip('#')
+    channels = [int(value[i:i + 2], 16) / 255 for i in (0, 2, 4)]
+    return tuple(c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4 for c in channels)
+
+def _linear_to_hex(rgb: Tuple[float, float, float]) -> str:
+    out = []
+    for c in rgb:
+        c = min(1.0, max(0.0, c))
+        c = c * 12.92 if c <= 0.0031308 else 1.055 * c ** (1 / 2.4) - 0.055
+        out.append(round(c * 255))
+    return "#{:02X}{:02X}{:02X}".format(*out)
+
+def _linear_to_oklch(rgb: Tuple[float, float, float]) -> Tuple[float, float, float]:
+    r, g, b = rgb
+    l = (0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b) ** (1 / 3)
+    m = (0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b) ** (1 / 3)
+    s = (0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b) ** (1 / 3)
+    lightness = 0.2104542553 * l + 0.7936177850 * m - 0.0040720468 * s
+    a = 1.9779984951 * l - 2.4285922050 * m + 0.4505937099 * s
+    b_ = 0.0259040371 * l + 0.7827717662 * m - 0.8086757660 * s
+    return lightness, math.hypot(a, b_), math.degrees(math.atan2(b_, a)) % 360
+
+def _oklch_to_linear_batch(rows: List[Tuple[float, float, float]]) -> List[Tuple[float, float, float]]:
+    """批量 OKLCH → 线性 sRGB；超出色域的行统一二分收缩色度"""
+    hues = [(math.cos(math.radians(h)), math.sin(math.radians(h))) for _, _, h in rows]
+
+    def convert(index: int, chroma: float) -> Tuple[float, float, float]:
+        lightness = rows[index][0]
+        a, b = chroma * hues[index][0], chroma * hues[index][1]
+        l = (lightness + 0.3963377774 * a + 0.2158037573 * b) ** 3
+        m = (lightness - 0.1055613458 * a - 0.0638541728 * b) ** 3
+        s = (lightness - 0.0894841775 * a - 1.2914855480 * b) ** 3
+        return (
+            4.0767416621 * l - 3.3077115913 * m + 0.2309699292 * s,
+            -1.2684380046 * l + 2.6097574011 * m - 0.3413193965 * s,
+            -0.0041960863 * l - 0.7034186147 * m + 1.7076147010 * s,
+        )
+
+    in_gamut = lambda rgb: all(-1e-6 <= c <= 1 + 1e-6 for c in rgb)
+    result = [convert(i, row[1]) for i, row in enumerate(rows)]
+    pending = [i for i, rgb in enumerate(result) if not in_gamut(rgb)]
+    if pending:
+        low = {i: 0.0 for i in pending}
+        high = {i: rows[i][1] for i in pending}
+        for _ in range(_GAMUT_STEPS):
+            for i in pending:
+                mid = (low[i] + high[i]) / 2
+                if in_gamut(convert(i, mid)):
+                    low[i] = mid
+                else:
+                    high[i] = mid
+        for i in pending:
+            result[i] = convert(i, low[i])
+    return result
+
+def _luminance(rgb: Tuple[float, float, float]) -> float:
+    r, g, b = (min(1.0, max(0.0, c)) for c in rgb)
+    return 0.2126 * r + 0.7152 * g + 0.0722 * b
+
+def _contrast_table(luminance: Dict[str, float]) -> Dict[Tuple[str, str], Optional[float]]:
+    """按 CONTRAST_REQUIREMENTS 一次性计算所有对比度；缺少亮度的令牌记为 None（未检查）"""
+    def lookup(operand: str) -> Optional[float]:
+        if operand in luminance:
+            return luminance[operand]
+        return _luminance(_hex_to_linear(operand)) if operand.startswith('#') else None
+
+    table = {}
+    for fg, bg, _minimum in CONTRAST_REQUIREMENTS:
+        lum_fg, lum_bg = lookup(fg), lookup(bg)
+        if lum_fg is None or lum_bg is None:
+            table[(fg, bg)] = None
+            continue
+        high, low = max(lum_fg, lum_bg), min(lum_fg, lum_bg)
+        table[(fg, bg)] = (high + 0.05) / (low + 0.05)
+    return table
+
+def _rgba(rgb: Tuple[float, float, float], alpha: float) -> str:
+    value = _linear_to_hex(rgb).lstrip('#')
+    r, g, b = (int(value[i:i + 2], 16) for i in (0, 2, 4))
+    return f"rgba({r}, {g}, {b}, {alpha:.2f})"
+
+@functools.lru_cache(maxsize=1024)
+def _derive_tables(accent: str, paper: str, ink: str) -> Tuple[Tuple[Tuple[str, str], ...], ...]:
+    """按种子预计算浅色/深色令牌表及对比度表（每组种子只算一次）"""
+    seeds = {
+        name: _linear_to_oklch(_hex_to_linear(color))
+        for name, color in (("accent", accent), ("paper", paper), ("ink", ink))
+    }
+    accent_chroma = seeds["accent"][1]
+
+    tables = []
+    for mode in (0, 1):
+        rows = []
+        for recipe in _TOKEN_RECIPES:
+            source, hue, lightness, chroma = recipe[1 + mode]
+            if source == "fixed":
+                rows.append((lightness, chroma * accent_chroma, hue))
+            else:
+                seed_l, seed_c, seed_h = seeds[source]
+                rows.append((seed_l if lightness is None else lightness, chroma * seed_c, seed_h))
+        linear = _oklch_to_linear_batch(rows)
+
+        colors = [(recipe[0], _linear_to_hex(rgb)) for recipe, rgb in zip(_TOKEN_RECIPES, linear)]
+        ink_rgb = linear[3]
+        for token, light_alpha, dark_alpha in _ALPHA_TOKENS:
+            shadow_rgb = (0.0, 0.0, 0.0) if mode and token.startswith("shadow") else ink_rgb
+            colors.append((token, _rgba(shadow_rgb, dark_alpha if mode else light_alpha)))
+
+        luminance = {recipe[0]: _luminance(rgb) for recipe, rgb in zip(_TOKEN_RECIPES, linear)}
+        contrast = tuple(_contrast_table(luminance).items())
+        tables.append((tuple(colors), contrast))
+    return tuple(tables)
+
+def derive_palettes(accent: str = DEFAULT_SEEDS["accent"],
+                    paper: str = DEFAULT_SEEDS["paper"],
+                    ink: str = DEFAULT_SEEDS["ink"]) -> Dict[str, Dict[str, str]]:
+    """由种子色生成浅色与深色调色板（与 get_colors() 相同的字典结构）"""
+    light, dark = _derive_tables(_normalize_hex(accent), _normalize_hex(paper), _normalize_hex(ink))
+    return {"light": dict(light[0]), "dark": dict(dark[0])}
+
+def derived_contrast_failures(accent: str = DEFAULT_SEEDS["accent"],
+                              paper: str = DEFAULT_SEEDS["paper"],
+                              ink: str = DEFAULT_SEEDS["ink"]) -> List[Tuple[str, str, str, float, float]]:
+    """生成调色板中未达到 WCAG 要求的组合：(模式, 前景, 背景, 对比度, 要求)"""
+    tables = _derive_tables(_normalize_hex(accent), _normalize_hex(paper), _normalize_hex(ink))
+    return _failures(zip(("light", "dark"), (dict(table[1]) for table in tables)))
+
+def check_palette_contrast(palette: Dict[str, str], mode: str = "light") -> List[Tuple[str, str, str, Optional[float], float]]:
+    """检查任意调色板（如用户 palette.json）的 WCAG 对比度
+
+    值不是 #RGB / #RRGGBB 的令牌（如 rgb(...)）无法检查，对应组合的对比度为 None。
+    """
+    luminance = {}
+    for token, color in palette.items():
+        try:
+            luminance[token] = _luminance(_hex_to_linear(str(color)))
+        except ValueError:
+            pass
+    return _failures([(mode, _contrast_table(luminance))])
+
+def _failures(tables) -> List[Tuple[str, str, str, Optional[float], float]]:
+    failures = []
+    for mode, table in tables:
+        for fg, bg, minimum in CONTRAST_REQUIREMENTS:
+            ratio = table[(fg, bg)]
+            if ratio is None or ratio < minimum:
+                failures.append((mode, fg, bg, ratio, minimum))
+    return failures
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#   INSTRUMENTATION — 性能统计
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# 每个热路径保留的耗时样本数（用于计算 p95）
+_STAT_SAMPLES = 1024
+
+# Anki 升级插件时会保留 user_files 目录
+USER_FILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "user_files")
+
+class _HotPathStat:
+    """单个热路径的计数与耗时"""
+
+    __slots__ = ("calls", "total", "samples", "bytes", "targets")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=_STAT_SAMPLES)
+        self.bytes = 0
+        self.targets = {}
+
+class WashiInstrumentation:
+    """热路径计数器与计时器（默认关闭）"""
+
+    def __init__(self):
+        self.enabled = False
+        self.stats: Dict[str, _HotPathStat] = {}
+
+    def _stat(self, name: str) -> _HotPathStat:
+        stat = self.stats.get(name)
+        if stat is None:
+            stat = self.stats[name] = _HotPathStat()
+        return stat
+
+    def record(self, name: str, elapsed: float, target: Optional[str] = None) -> None:
+        """记录一次调用"""
+        stat = self._stat(name)
+        stat.calls += 1
+        stat.total += elapsed
+        stat.samples.append(elapsed)
+        if target is not None:
+            entry = stat.targets.setdefault(target, [0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+
+    def record_bytes(self, name: str, text: str) -> None:
+        """记录实际应用的样式字节数"""
+        if self.enabled:
+            self._stat(name).bytes += len(text.encode('utf-8'))
+
+    def reset(self) -> None:
+        self.stats = {}
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """返回当前统计的快照（时间单位为毫秒）"""
+        result = {}
+        for name, stat in list(self.stats.items()):
+            samples = sorted(stat.samples)
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0
+            targets = sorted(stat.targets.items(), key=lambda item: item[1][1], reverse=True)
+            result[name] = {
+                "calls": stat.calls,
+                "total_ms": stat.total * 1000,
+                "mean_ms": stat.total * 1000 / stat.calls if stat.calls else 0.0,
+                "p95_ms": p95 * 1000,
+                "bytes": stat.bytes,
+                "targets": {
+                    target: {"calls": calls, "total_ms": total * 1000}
+                    for target, (calls, total) in targets
+                },
+            }
+        return result
+
+_instrumentation = WashiInstrumentation()
+
+class WashiTracer:
+    """记录 Chrome trace-event 格式的时间线（Python 与网页两侧）"""
+
+    # 网页消息前缀，经 pycmd 回传
+    MESSAGE_PREFIX = "washi:trace:"
+
+    def __init__(self):
+        self.active = False
+        self.events = []
+        self._origin = 0.0
+        self._wall_origin = 0.0
+        self._tracks = {}
+        self._pending = {}
+        self._next_id = 0
+
+    def start(self) -> None:
+        """开始记录（清空之前的事件）"""
+        self.events = []
+        self._tracks = {}
+        self._pending = {}
+        self._origin = time.perf_counter()
+        self._wall_origin = time.time()
+        self._metadata(0, "Qt main thread")
+        self.active = True
+
+    def _metadata(self, tid: int, name: str) -> None:
+        self.events.append({
+            "name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+            "args": {"name": name},
+        })
+
+    def _track(self, label: str) -> int:
+        """每个网页视图一条独立轨道"""
+        tid = self._tracks.get(label)
+        if tid is None:
+            tid = self._tracks[label] = len(self._tracks) + 1
+            self._metadata(tid, f"webview {label}")
+        return tid
+
+    def complete(self, name: str, start: float, end: float,
+                 target: Optional[str] = None, tid: int = 0, cat: str = "python") -> None:
+        """记录一个完整区间（start/end 为 perf_counter 秒）"""
+        event = {
+            "name": name, "cat": cat, "ph": "X", "pid": os.getpid(), "tid": tid,
+            "ts": (start - self._origin) * 1e6, "dur": (end - start) * 1e6,
+        }
+        if target is not None:
+            event["args"] = {"target": target}
+        self.events.append(event)
+
+    def page_request(self, label: str) -> int:
+        """为一次网页更新分配 id，等待网页回传时间点"""
+        self._next_id += 1
+        self._pending[self._next_id] = label
+        return self._next_id
+
+    def page_report(self, payload: Dict[str, float]) -> None:
+        """记录网页侧 performance.now() 时间点（以毫秒 epoch 表示）"""
+        label = self._pending.pop(payload.get("id"), None)
+        if label is None:
+            return
+        tid = self._track(label)
+        to_counter = lambda epoch_ms: epoch_ms / 1000 - self._wall_origin + self._origin
+        start = to_counter(payload["start"])
+        applied = to_counter(payload["applied"])
+        painted = to_counter(payload["painted"])
+        self.complete("style recalc", start, applied, label, tid, "webview")
+        self.complete("next frame", applied, painted, label, tid, "webview")
+
+    def stop(self, path: str) -> str:
+        """停止记录并写出 trace JSON 文件"""
+        self.active = False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+        self.events = []
+        self._pending = {}
+        return path
+
+_tracer = WashiTracer()
+
+class WashiPageMonitor:
+    """网页侧样式开销监控：按页面类型设定预算，写入滚动日志"""
+
+    MESSAGE_PREFIX = "washi:perf:"
+
+    # 每次报告允许的样式表解析与布局耗时（毫秒）。长任务（≥50ms）可能来自卡片脚本等，
+    # 不计入预算，只单独记录与样式表插入或布局测量重叠的个数
+    BUDGETS_MS = {
+        "Reviewer": 16.0,
+        "Overview": 33.0,
+        "DeckBrowser": 50.0,
+        "DeckStats": 100.0,
+        "NewDeckStats": 100.0,
+    }
+    DEFAULT_BUDGET_MS = 33.0
+
+    LOG_FILE = "washi-perf.log"
+    LOG_MAX_BYTES = 256 * 1024
+    LOG_BACKUPS = 3
+
+    def __init__(self):
+        self.enabled = False
+        self._logger = None
+
+    @property
+    def logger(self) -> logging.Logger:
+        if self._logger is None:
+            logger = logging.getLogger("washi_theme.perf")
+            logger.propagate = False
+            os.makedirs(USER_FILES_DIR, exist_ok=True)
+            handler = RotatingFileHandler(
+                os.path.join(USER_FILES_DIR, self.LOG_FILE),
+                maxBytes=self.LOG_MAX_BYTES, backupCount=self.LOG_BACKUPS,
+                encoding="utf-8",
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            self._logger = logger
+        return self._logger
+
+    def budget_for(self, context: str) -> float:
+        return self.BUDGETS_MS.get(context, self.DEFAULT_BUDGET_MS)
+
+    def report(self, payload: Dict[str, object]) -> None:
+        """记录一次网页回报，超出预算时写入警告"""
+        context = str(payload.get("context", "unknown"))
+        cost = sum(float(payload.get(key, 0.0)) for key in ("sheet_ms", "layout_ms"))
+        budget = self.budget_for(context)
+        line = json.dumps(dict(payload, cost_ms=round(cost, 3), budget_ms=budget))
+        if cost > budget:
+            self.logger.warning("over budget %s", line)
+        else:
+            self.logger.info("%s", line)
+
+_page_monitor = WashiPageMonitor()
+
+def _describe_target(obj: object) -> Optional[str]:
+    """生成组件或网页视图的可读名称"""
+    if obj is None:
+        return None
+    name = type(obj).__name__
+    try:
+        kind = getattr(obj, 'kind', None)
+        if kind is not None:
+            return f"{name}[{getattr(kind, 'name', kind)}]"
+        object_name = obj.objectName() if hasattr(obj, 'objectName') else ""
+    except RuntimeError:
+        return name  # Widget was deleted
+    return f"{name}#{object_name}" if object_name else name
+
+def _instrumented(target=None):
+    """为热路径添加计数、计时与 trace 区间；关闭时仅多一次属性检查"""
+    def decorator(func):
+        name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not (_instrumentation.enabled or _tracer.active):
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = time.perf_counter()
+                label = _describe_target(target(*args, **kwargs)) if target else None
+                if _instrumentation.enabled:
+                    _instrumentation.record(name, end - start, label)
+                if _tracer.active:
+                    _tracer.complete(name, start, end, label)
+        return wrapper
+    return decorator
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #   CSS STYLESHEETS — 样式表
 # ═══════════════════════════════════════════════════════════════════════════════
 
+@_instrumented()
 def _get_menu_bar_css(colors: Dict[str, str]) -> str:
     return f"""
 /* ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -146,6 +626,7 @@ QMenuBar::item:pressed {{
 }}
 """
 
+@_instrumented()
 def _get_menu_dropdown_css(colors: Dict[str, str]) -> str:
     return f"""
 /* ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -191,6 +672,7 @@ QMenu::indicator {{
 }}
 """
 
+@_instrumented()
 def _get_global_css(colors: Dict[str, str]) -> str:
     return f"""
 /* ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -482,14 +964,15 @@ QToolTip {{
 }}
 """
 
+@_instrumented()
 def _get_web_css(colors: Dict[str, str]) -> str:
     return f"""
 /* ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
    WASHI WEB STYLES — 网页样式
    ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━ */
 
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&family=Noto+Serif+JP:wght@400;500;600;700&display=swap');
-
+@import url('https://fonts.googleapis.com/css2?family=Noto+Serif+JP:wght@400;500;600;700&display=swap');
+{_web_font_faces()}
 :root {{
     --washi-paper-primary: {colors['paper_primary']};
     --washi-paper-secondary: {colors['paper_secondary']};
@@ -694,6 +1177,242 @@ a:hover {{
 }}
 """
 
+@_instrumented()
+def _get_deck_browser_css(colors: Dict[str, str]) -> str:
+    return """
+/* ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+   DECK BROWSER SCALING — 牌组列表（大量牌组）
+   ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━ */
+
+/* Each row is its own layout/paint island: hovering or collapsing one deck
+   must not invalidate the thousands of rows around it. Table rows cannot
+   take containment themselves, so it goes on the cells. */
+tr.deck > td {
+    contain: layout paint;
+}
+
+tr.deck, tr.deck td, tr.deck a, tr.deck button, tr.deck .gears {
+    transition: none;
+    animation: none;
+}
+
+/* Lifted hover shadows would be clipped by paint containment anyway */
+tr.deck button:hover, tr.deck .button:hover {
+    transform: none;
+    box-shadow: none;
+}
+"""
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#   STYLE EXTENSIONS — 扩展样式
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class WashiStyleRegistry:
+    """其他插件注册的样式片段，编译进和纸样式表而不是各自 setStyleSheet
+
+    QSS 片段以组件类名（可带子控件/伪状态，如 "QTableView::item:selected"）为键，
+    内容为声明，例如 "background: $paper_elevated;"。
+    网页片段以页面上下文类名（如 "Reviewer"，"*" 表示所有页面）为键，内容为完整的
+    CSS 规则，例如 ".card { border-color: $vermilion; }"。
+    两者都用 $token 引用调色板令牌。
+    """
+
+    KINDS = ("qss", "web")
+
+    def __init__(self):
+        self.fragments = []
+        self._tables = {}
+        self._context_rules = {}
+
+    def register(self, contributor: str, target: str, css: str, kind: str = "qss") -> None:
+        if kind not in self.KINDS:
+            raise ValueError(f"kind must be one of {self.KINDS}, not {kind!r}")
+        try:
+            Template(css).substitute(WASHI_COLORS_LIGHT)
+        except KeyError as e:
+            raise ValueError(f"unknown palette token ${e.args[0]} in fragment from {contributor}") from None
+        self.fragments.append((contributor, kind, target, css.strip()))
+        self._tables = {}
+        self._context_rules = {}
+
+    def unregister(self, contributor: str) -> None:
+        self.fragments = [f for f in self.fragments if f[0] != contributor]
+        self._tables = {}
+        self._context_rules = {}
+
+    def _build(self, kind: str, colors: Dict[str, str]) -> Dict[str, List[Tuple[str, str]]]:
+        table = {}
+        for contributor, fragment_kind, target, css in self.fragments:
+            if fragment_kind != kind:
+                continue
+            body = Template(css).substitute(colors)
+            if kind == "qss":
+                rule = f"/* {contributor} */\n{target} {{\n    {body}\n}}\n"
+                target = target.split(':')[0]
+            else:
+                rule = f"/* {contributor} */\n{body}\n"
+            table.setdefault(target, []).append((contributor, rule))
+        return table
+
+    def table(self, kind: str, colors: Dict[str, str]) -> Dict[str, List[Tuple[str, str]]]:
+        """预编译的 类名/上下文 → [(贡献者, 规则)] 表（每种调色板只编译一次）"""
+        if isinstance(colors, _TokenRecorder):
+            return self._build(kind, colors)  # 依赖追踪时不走缓存，确保令牌被记录
+        key = (kind, tuple(colors.values()))
+        table = self._tables.get(key)
+        if table is None:
+            table = self._tables[key] = self._build(kind, colors)
+        return table
+
+    def compile(self, kind: str, colors: Dict[str, str], target: str = None) -> str:
+        """拼接某类片段；target 为 None 时拼接全部（网页时只取 "*"）"""
+        table = self.table(kind, colors)
+        if kind == "web" and target is None:
+            target = "*"
+        keys = table if target is None else [target]
+        return "".join(rule for key in keys for _contributor, rule in table.get(key, []))
+
+    def web_rules_for(self, context: Optional[object], colors: Dict[str, str]) -> str:
+        """按页面上下文类（含父类）分派网页片段"""
+        if context is None:
+            return ""
+        key = (type(context), tuple(colors.values()))
+        rules = self._context_rules.get(key)
+        if rules is None:
+            table = self.table("web", colors)
+            names = [cls.__name__ for cls in type(context).__mro__]
+            rules = "".join(
+                rule for name in names if name != "*" for _contributor, rule in table.get(name, [])
+            )
+            self._context_rules[key] = rules
+        return rules
+
+    def conflicts(self) -> List[Dict[str, object]]:
+        """不同贡献者在同一上下文中为同一选择器声明了同一属性"""
+        owners = {}
+        for contributor, kind, target, css in self.fragments:
+            if kind == "qss":
+                rules = [("", target, css)]
+            else:
+                rules = [(target, selector.strip(), body) for selector, body in _CSS_RULE.findall(css)]
+            for context, selector, body in rules:
+                for declaration in body.split(';'):
+                    prop = declaration.split(':', 1)[0].strip().lower()
+                    if prop:
+                        owners.setdefault((kind, context, selector, prop), set()).add(contributor)
+        return [
+            {"kind": kind, "context": context or None, "selector": selector,
+             "property": prop, "contributors": sorted(names)}
+            for (kind, context, selector, prop), names in owners.items() if len(names) > 1
+        ]
+
+    def report(self, colors: Dict[str, str]) -> Dict[str, object]:
+        """每个贡献者编译后的字节数，以及冲突列表"""
+        contributors = {}
+        for kind in self.KINDS:
+            for entries in self.table(kind, colors).values():
+                for contributor, rule in entries:
+                    entry = contributors.setdefault(
+                        contributor, {"fragments": 0, "qss_bytes": 0, "web_bytes": 0}
+                    )
+                    entry["fragments"] += 1
+                    entry[f"{kind}_bytes"] += len(rule.encode('utf-8'))
+        return {"contributors": contributors, "conflicts": self.conflicts()}
+
+# 网页片段中的 "选择器 { 声明 }"（不处理嵌套的 @media 等块）
+_CSS_RULE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+
+_style_registry = WashiStyleRegistry()
+
+def _compile_global_css(colors: Dict[str, str]) -> str:
+    return _get_global_css(colors) + _style_registry.compile("qss", colors)
+
+def _compile_web_css(colors: Dict[str, str]) -> str:
+    return _get_web_css(colors) + _style_registry.compile("web", colors)
+
+# 样式段：名称 → 生成函数（缓存属性为 _<名称>_css_cache_<light|dark>）
+CSS_SECTIONS = {
+    "menu_bar": _get_menu_bar_css,
+    "menu_dropdown": _get_menu_dropdown_css,
+    "global": _compile_global_css,
+    "web": _compile_web_css,
+    "deck_browser": _get_deck_browser_css,
+}
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#   PALETTE HOT-RELOAD — 调色板热加载
+# ═══════════════════════════════════════════════════════════════════════════════
+
+PALETTE_FILE = "palette.json"
+
+class _TokenRecorder(dict):
+    """记录生成样式时读取了哪些色彩令牌"""
+
+    def __init__(self, colors: Dict[str, str]):
+        super().__init__(colors)
+        self.used = set()
+
+    def __getitem__(self, key: str) -> str:
+        self.used.add(key)
+        return super().__getitem__(key)
+
+def build_token_graph() -> Dict[str, Set[str]]:
+    """色彩令牌 → 使用它的样式段"""
+    graph = {}
+    for section, generator in CSS_SECTIONS.items():
+        recorder = _TokenRecorder(WASHI_COLORS_LIGHT)
+        generator(recorder)
+        for token in recorder.used:
+            graph.setdefault(token, set()).add(section)
+    return graph
+
+class WashiPaletteStore:
+    """用户调色板：user_files/palette.json 覆盖内置色值
+
+    文件格式为 {"light": {"vermilion_pale": "#F5E6E4", ...}, "dark": {...}}，
+    未列出的令牌沿用 WASHI_COLORS_LIGHT / WASHI_COLORS_DARK。
+    可选的 "seeds": {"accent": ..., "paper": ..., "ink": ...} 会先用
+    derive_palettes() 生成基础调色板，再叠加 light / dark 中的覆盖值。
+    """
+
+    DEFAULTS = {"light": WASHI_COLORS_LIGHT, "dark": WASHI_COLORS_DARK}
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.path.join(USER_FILES_DIR, PALETTE_FILE)
+        self.palettes = {mode: dict(colors) for mode, colors in self.DEFAULTS.items()}
+
+    def load(self) -> Dict[str, Set[str]]:
+        """重新读取文件，返回每种模式下发生变化的令牌"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        except (OSError, ValueError):
+            return {}  # 保存到一半或格式错误：保留当前调色板
+        if not isinstance(data, dict):
+            return {}
+
+        bases = self.DEFAULTS
+        seeds = data.get("seeds")
+        if isinstance(seeds, dict):
+            try:
+                bases = derive_palettes(**{k: str(v) for k, v in seeds.items() if k in DEFAULT_SEEDS})
+            except ValueError:
+                pass  # 种子色不合法：沿用内置调色板，仍然应用 light / dark 覆盖值
+
+        changed = {}
+        for mode, defaults in bases.items():
+            overrides = data.get(mode)
+            palette = dict(defaults)
+            if isinstance(overrides, dict):
+                palette.update({k: str(v) for k, v in overrides.items() if k in defaults})
+            tokens = {k for k in palette if palette[k] != self.palettes[mode][k]}
+            if tokens:
+                self.palettes[mode] = palette
+                changed[mode] = tokens
+        return changed
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #   THEME MANAGER — 主题管理器
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -704,25 +1423,49 @@ class WashiThemeManager:
     # CSS cache for performance optimization
     _css_cache_light = None
     _css_cache_dark = None
+    _menu_bar_css_cache_light = None
+    _menu_bar_css_cache_dark = None
+    _menu_dropdown_css_cache_light = None
+    _menu_dropdown_css_cache_dark = None
     _global_css_cache_light = None
     _global_css_cache_dark = None
     _web_css_cache_light = None
     _web_css_cache_dark = None
+    _deck_browser_css_cache_light = None
+    _deck_browser_css_cache_dark = None
+
+    # 大量牌组时为牌组列表启用行级隔离（contain + 无过渡）
+    deck_browser_scaling = True
+
+    # 设置为 True 的 Qt 动态属性表示该组件（或窗口）不使用主题
+    EXCLUDE_PROPERTY = "washiExclude"
+
+    # 调色板文件保存后合并多次写入的等待时间（毫秒）
+    PALETTE_RELOAD_DELAY_MS = 30
 
     def __init__(self):
-        self.styled_widgets = []
+        # 插入有序的字典作为集合使用：成员检查为 O(1)
+        self.styled_widgets = {}
+        self.styled_menus = {}
+        self.excluded_widgets = {}
         self.webviews = []
         self._current_is_dark = None
+        self.palette_store = WashiPaletteStore()
+        self.palette_store.load()
+        self._token_graph = None
+        self._palette_watcher = None
+        self._palette_timer = None
+        self.last_palette_reload = None
 
     def _invalidate_css_cache(self) -> None:
         """清除CSS缓存（当主题切换时调用）"""
         self._css_cache_light = None
-        _css_cache_dark = None
-        self._global_css_cache_light = None
-        self._global_css_cache_dark = None
-        self._web_css_cache_light = None
-        self._web_css_cache_dark = None
+        self._css_cache_dark = None
+        for section in CSS_SECTIONS:
+            for mode in ('light', 'dark'):
+                setattr(self, f'_{section}_css_cache_{mode}', None)
 
+    @_instrumented()
     def _get_cached_css(self, cache_attr: str, colors: Dict[str, str], css_generator_func) -> str:
         """获取缓存的CSS或生成新的CSS"""
         cache_value = getattr(self, cache_attr)
@@ -750,7 +1493,14 @@ class WashiThemeManager:
     @property
     def colors(self) -> Dict[str, str]:
         """获取当前主题颜色"""
-        return WASHI_COLORS_DARK if self.is_dark else WASHI_COLORS_LIGHT
+        return self.palette_store.palettes['dark' if self.is_dark else 'light']
+
+    def section_css(self, section: str) -> str:
+        """获取当前模式下某个样式段的缓存CSS"""
+        mode = 'dark' if self.is_dark else 'light'
+        return self._get_cached_css(
+            f'_{section}_css_cache_{mode}', self.colors, CSS_SECTIONS[section]
+        )
 
     def _is_widget_valid(self, widget: QWidget) -> bool:
         """检查组件是否仍然有效"""
@@ -759,9 +1509,11 @@ class WashiThemeManager:
         except Exception:
             return False
 
+    @_instrumented(target=lambda self, widget, css: widget)
     def apply_stylesheet(self, widget: QWidget, css: str) -> None:
         """应用样式表到组件"""
         if self._is_widget_valid(widget):
+            _instrumentation.record_bytes('apply_stylesheet', css)
             try:
                 widget.setStyleSheet(css)
             except RuntimeError:
@@ -769,26 +1521,139 @@ class WashiThemeManager:
 
     def style_menubar(self, menubar: QMenuBar) -> None:
         """样式化菜单栏"""
-        css = _get_menu_bar_css(self.colors)
+        css = self.section_css('menu_bar')
         self.apply_stylesheet(menubar, css)
         menubar.setMaximumHeight(36)
 
     def style_menu(self, menu: QMenu) -> None:
         """样式化下拉菜单"""
-        css = _get_menu_dropdown_css(self.colors)
+        self.styled_menus.setdefault(menu)
+        css = self.section_css('menu_dropdown')
         self.apply_stylesheet(menu, css)
 
+    def is_excluded(self, widget: QWidget) -> bool:
+        """组件是否通过 EXCLUDE_PROPERTY 选择不使用主题"""
+        try:
+            return bool(widget.property(self.EXCLUDE_PROPERTY))
+        except (RuntimeError, AttributeError):
+            return False
+
+    def exclude(self, widget: QWidget, excluded: bool = True) -> None:
+        """标记组件不使用主题，并重新样式化其所在窗口以绕开该组件"""
+        widget.setProperty(self.EXCLUDE_PROPERTY, excluded)
+        window = widget.window()
+        if excluded:
+            self.excluded_widgets.setdefault(widget)
+            if self._is_washi_sheet(widget.styleSheet()):
+                self.apply_stylesheet(widget, "")
+        else:
+            # 移除之前为绕开该组件而分别设置在旁支上的样式表
+            for node in self._excluded_path(window):
+                for child in node.children():
+                    if isinstance(child, QWidget) and self._is_washi_sheet(child.styleSheet()):
+                        self.apply_stylesheet(child, "")
+            self.excluded_widgets.pop(widget, None)
+        if window is not widget and window in self.styled_widgets:
+            self.style_widget(window)
+
+    def _is_washi_sheet(self, sheet: str) -> bool:
+        """样式表是否为（任一模式下的）全局和纸样式表"""
+        return bool(sheet) and sheet in (self._global_css_cache_light, self._global_css_cache_dark)
+
+    def _excluded_path(self, widget: QWidget) -> Set[QWidget]:
+        """widget 与其被排除的后代之间的祖先（含 widget 本身）；没有被排除的后代时为空"""
+        path = set()
+        for excluded in list(self.excluded_widgets):
+            if not self._is_widget_valid(excluded):
+                self.excluded_widgets.pop(excluded, None)
+                continue
+            chain = []
+            parent = excluded.parentWidget()
+            while parent is not None and parent is not widget:
+                chain.append(parent)
+                parent = parent.parentWidget()
+            if parent is not None:
+                path.add(widget)
+                path.update(chain)
+        return path
+
+    def _apply_global_css(self, widget: QWidget, css: str, force: bool = True) -> bool:
+        """应用全局样式表。样式表会级联到所有后代，因此若子树中有被排除的组件，
+        通往它的祖先不设置样式表，改为分别样式化旁支（只写入没有样式表或带有和纸
+        样式表的旁支，菜单栏由 style_menubar 负责）。返回是否设置了样式表"""
+        path = self._excluded_path(widget)
+        if not path:
+            if not force and widget.styleSheet() == css:
+                return False  # 已是当前样式表，避免无谓的重新 polish
+            self.apply_stylesheet(widget, css)
+            return True
+        for node in path:
+            if self._is_washi_sheet(node.styleSheet()):
+                self.apply_stylesheet(node, "")
+            for child in node.children():
+                if (not isinstance(child, QWidget) or isinstance(child, QMenuBar) or child.isWindow()
+                        or child in path or self.is_excluded(child)):
+                    continue
+                sheet = child.styleSheet()
+                if sheet and not self._is_washi_sheet(sheet):
+                    continue  # 保留其他插件或组件自身的样式表
+                if force or sheet != css:
+                    self.apply_stylesheet(child, css)
+        return True
+
+    def _inherits_global_css(self, widget: QWidget, css: str) -> bool:
+        """widget 是否已经从某个祖先继承了当前全局样式表"""
+        parent = widget.parentWidget()
+        while parent is not None:
+            if parent.styleSheet() == css:
+                return not self._excluded_path(parent)
+            parent = parent.parentWidget()
+        return False
+
     def style_widget(self, widget: QWidget) -> None:
         """样式化组件"""
-        if widget not in self.styled_widgets:
-            self.styled_widgets.append(widget)
-        css = _get_global_css(self.colors)
-        self.apply_stylesheet(widget, css)
+        if self.is_excluded(widget):
+            return
+        self.styled_widgets.setdefault(widget)
+        css = self.section_css('global')
+        self._apply_global_css(widget, css)
+
+    def style_widgets(self, widgets: Iterable[QWidget]) -> int:
+        """批量样式化：只对传入组件中最外层的那些应用一次共享样式表（其余通过级联继承），
+        应用期间暂停重绘。返回实际重新应用的组件数"""
+        candidates = dict.fromkeys(
+            w for w in widgets if self._is_widget_valid(w) and not self.is_excluded(w)
+        )
+        css = self.section_css('global')
+        roots = []
+        for widget in candidates:
+            parent = widget.parentWidget()
+            while parent is not None and parent not in candidates:
+                parent = parent.parentWidget()
+            # 祖先已带有当前样式表时子组件已通过级联继承，无需再解析一次
+            if parent is None and not self._inherits_global_css(widget, css):
+                roots.append(widget)
+
+        styled = 0
+        for widget in roots:
+            self.styled_widgets.setdefault(widget)
+            widget.setUpdatesEnabled(False)
+            try:
+                styled += self._apply_global_css(widget, css, force=False)
+            finally:
+                widget.setUpdatesEnabled(True)
+        return styled
+
+    def register_webview(self, webview: AnkiWebView) -> None:
+        """记录已注入样式的网页视图（用于调色板热加载）"""
+        if webview not in self.webviews:
+            self.webviews.append(webview)
 
+    @_instrumented()
     def refresh_all(self) -> None:
         """刷新所有样式"""
         # 清理已删除的组件
-        self.styled_widgets = [w for w in self.styled_widgets if self._is_widget_valid(w)]
+        self.styled_widgets = dict.fromkeys(w for w in self.styled_widgets if self._is_widget_valid(w))
 
         for widget in self.styled_widgets:
             self.style_widget(widget)
@@ -796,20 +1661,107 @@ class WashiThemeManager:
         if mw and hasattr(mw, 'form') and hasattr(mw.form, 'menubar'):
             self.style_menubar(mw.form.menubar)
 
+    def sections_for_tokens(self, tokens: Set[str]) -> Set[str]:
+        """受这些色彩令牌影响的样式段"""
+        if self._token_graph is None:
+            self._token_graph = build_token_graph()
+        sections = set()
+        for token in tokens:
+            sections |= self._token_graph.get(token, set())
+        return sections
+
+    def apply_palette_changes(self, changed: Dict[str, Set[str]]) -> Set[str]:
+        """只重新编译受影响的样式段，并只重新应用当前模式下用到它们的界面"""
+        current = 'dark' if self.is_dark else 'light'
+        affected = set()
+        for mode, tokens in changed.items():
+            sections = self.sections_for_tokens(tokens)
+            for section in sections:
+                setattr(self, f'_{section}_css_cache_{mode}', None)
+            if mode == current:
+                affected |= sections
+        self.reapply_sections(affected)
+        return affected
+
+    def reapply_sections(self, affected: Set[str]) -> None:
+        """重新应用用到这些样式段的组件、菜单与网页视图"""
+        if 'global' in affected:
+            self.styled_widgets = dict.fromkeys(w for w in self.styled_widgets if self._is_widget_valid(w))
+            css = self.section_css('global')
+            for widget in self.styled_widgets:
+                self._apply_global_css(widget, css)
+        if 'menu_dropdown' in affected:
+            self.styled_menus = dict.fromkeys(m for m in self.styled_menus if self._is_widget_valid(m))
+            for menu in self.styled_menus:
+                self.style_menu(menu)
+        if 'menu_bar' in affected and mw and hasattr(mw, 'form') and hasattr(mw.form, 'menubar'):
+            self.style_menubar(mw.form.menubar)
+        if 'web' in affected:
+            self.webviews = [v for v in self.webviews if self._is_widget_valid(v)]
+            for webview in self.webviews:
+                update_webview_styles(webview)
+
+    def reload_extensions(self) -> None:
+        """扩展片段变化后重新编译 global / web 样式段并（在空闲时）重新应用"""
+        for section in ('global', 'web'):
+            for mode in ('light', 'dark'):
+                setattr(self, f'_{section}_css_cache_{mode}', None)
+        self._token_graph = None
+        _scheduler.submit("reload_extensions", lambda: self.reapply_sections({'global', 'web'}))
+
+    @_instrumented()
+    def reload_palette(self) -> Set[str]:
+        """重新读取调色板文件并增量应用"""
+        start = time.perf_counter()
+        sections = self.apply_palette_changes(self.palette_store.load())
+        done = time.time()
+        try:
+            saved = os.stat(self.palette_store.path).st_mtime
+        except OSError:
+            saved = done
+        self.last_palette_reload = {
+            "sections": sorted(sections),
+            "apply_ms": (time.perf_counter() - start) * 1000,
+            "latency_ms": (done - saved) * 1000,
+        }
+        return sections
+
+    def watch_palette_file(self) -> None:
+        """用 QFileSystemWatcher 监视调色板文件（及其目录，以便发现新建或原子替换）"""
+        if self._palette_watcher is not None:
+            self._palette_watcher.deleteLater()
+        path = self.palette_store.path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._palette_timer = QTimer()
+        self._palette_timer.setSingleShot(True)
+        self._palette_timer.timeout.connect(
+            lambda: _scheduler.submit("reload_palette", self.reload_palette)
+        )
+
+        self._palette_watcher = QFileSystemWatcher()
+        self._palette_watcher.addPath(os.path.dirname(path))
+        if os.path.exists(path):
+            self._palette_watcher.addPath(path)
+
+        def on_change(_changed_path: str) -> None:
+            # 编辑器原子保存会替换文件，需要重新监视
+            if os.path.exists(path) and path not in self._palette_watcher.files():
+                self._palette_watcher.addPath(path)
+            self._palette_timer.start(self.PALETTE_RELOAD_DELAY_MS)
+
+        self._palette_watcher.fileChanged.connect(on_change)
+        self._palette_watcher.directoryChanged.connect(on_change)
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #   WEB VIEW STYLING — 网页视图样式
 # ═══════════════════════════════════════════════════════════════════════════════
 
+@_instrumented(target=lambda web_content, context: context)
 def inject_washi_styles(web_content: aqt.webview.WebContent, context: Optional[object]) -> None:
     """注入和纸样式到网页（使用缓存优化）"""
-    colors = theme_manager_instance.colors
-    is_dark = theme_manager_instance.is_dark
-    cache_attr = '_web_css_cache_dark' if is_dark else '_web_css_cache_light'
-
     # 使用缓存的CSS
-    css = theme_manager_instance._get_cached_css(
-        cache_attr, colors, _get_web_css
-    )
+    css = theme_manager_instance.section_css('web')
 
     styles = f'''
     <style id="washi-theme">
@@ -817,49 +1769,455 @@ def inject_washi_styles(web_content: aqt.webview.WebContent, context: Optional[o
     </style>
     '''
 
+    # 牌组列表使用独立的 style 元素，避免被 update_webview_styles 覆盖
+    if theme_manager_instance.deck_browser_scaling and isinstance(context, DeckBrowser):
+        deck_css = theme_manager_instance.section_css('deck_browser')
+        styles += f'''
+    <style id="washi-deck-browser">
+        {deck_css}
+    </style>
+    '''
+
+    extension_css = _style_registry.web_rules_for(context, theme_manager_instance.colors)
+    if extension_css:
+        styles += f'''
+    <style id="washi-extensions">
+        {extension_css}
+    </style>
+    '''
+
+    if _page_monitor.enabled:
+        styles = _page_monitor_script(context, before=True) + styles + _page_monitor_script(context)
+
     if hasattr(web_content, 'head'):
+        _instrumentation.record_bytes('inject_washi_styles', styles)
         web_content.head += styles
 
-def update_webview_styles(webview: AnkiWebView) -> None:
-    """更新网页视图样式（使用缓存优化）"""
-    colors = theme_manager_instance.colors
-    is_dark = theme_manager_instance.is_dark
-    cache_attr = '_web_css_cache_dark' if is_dark else '_web_css_cache_light'
+def _page_monitor_script(context: Optional[object], before: bool = False) -> str:
+    """样式预算监控脚本：样式表前后各一段，测量样式表解析、首次布局、长任务与布局偏移
 
-    # 使用缓存的CSS
-    css = theme_manager_instance._get_cached_css(
-        cache_attr, colors, _get_web_css
-    )
+    style_long_tasks 只统计与样式表插入或布局测量时间段重叠的长任务。
+    """
+    if before:
+        return '''
+    <script>window.__washiSheetStart = performance.now();</script>
+    '''
+    return f'''
+    <script>
+    (() => {{
+        const sheetEnd = performance.now();
+        const sheetStart = window.__washiSheetStart || sheetEnd;
+        const stats = {{
+            context: "{type(context).__name__}",
+            sheet_ms: sheetEnd - sheetStart,
+            layout_ms: 0, long_tasks: 0, long_task_ms: 0, style_long_tasks: 0, layout_shift: 0,
+        }};
+        // 样式相关的时间段；长任务在报告时按重叠归因
+        const windows = [[sheetStart, sheetEnd]];
+        let longTasks = [];
+        let dirty = true;
+        const observe = (type, handler) => {{
+            try {{
+                new PerformanceObserver(list => {{
+                    list.getEntries().forEach(handler);
+                    dirty = true;
+                }}).observe({{type, buffered: true}});
+            }} catch (e) {{}}
+        }};
+        observe("longtask", entry => {{
+            stats.long_tasks += 1;
+            stats.long_task_ms += entry.duration;
+            longTasks.push(entry);
+        }});
+        observe("layout-shift", entry => {{
+            if (!entry.hadRecentInput) stats.layout_shift += entry.value;
+        }});
+        document.addEventListener("DOMContentLoaded", () => {{
+            const start = performance.now();
+            document.body.offsetHeight;
+            stats.layout_ms = performance.now() - start;
+            windows.push([start, start + stats.layout_ms]);
+        }});
+        const report = () => {{
+            const send = window.pycmd || window.bridgeCommand;
+            if (!dirty || !send) return;
+            stats.style_long_tasks = longTasks.filter(entry => windows.some(
+                ([from, to]) => entry.startTime <= to && entry.startTime + entry.duration >= from
+            )).length;
+            longTasks = [];
+            send("{WashiPageMonitor.MESSAGE_PREFIX}" + JSON.stringify(stats));
+            // 之后的报告只包含新增的长任务与布局偏移
+            Object.assign(stats, {{sheet_ms: 0, layout_ms: 0, long_tasks: 0, long_task_ms: 0, style_long_tasks: 0, layout_shift: 0}});
+            dirty = false;
+        }};
+        window.addEventListener("load", () => {{
+            setTimeout(report, 2000);
+            setInterval(report, 10000);
+        }});
+    }})();
+    </script>
+    '''
 
+def _wrap_traced_js(js: str, trace_id: int) -> str:
+    """在网页中用 performance.now() 记录样式重算与下一帧，并经 pycmd 回传"""
+    return f'''
+    (() => {{
+        const now = () => performance.timeOrigin + performance.now();
+        const start = now();
+        {js};
+        getComputedStyle(document.body || document.documentElement).color;
+        const applied = now();
+        requestAnimationFrame(() => setTimeout(() => {{
+            const send = window.pycmd || window.bridgeCommand;
+            if (send) {{
+                send("{WashiTracer.MESSAGE_PREFIX}" + JSON.stringify({{
+                    id: {trace_id}, start, applied, painted: now()
+                }}));
+            }}
+        }}, 0));
+    }})()
+    '''
+
+@_instrumented(target=lambda webview: webview)
+def update_webview_styles(webview: AnkiWebView) -> None:
+    """更新网页视图样式（使用缓存优化）"""
+    # 使用缓存的CSS；扩展片段按网页视图的上下文（bridge context）选取
+    sheets = {'washi-theme': theme_manager_instance.section_css('web')}
+    context = getattr(webview, '_bridge_context', None)
+    extension_css = _style_registry.web_rules_for(context, theme_manager_instance.colors)
+    if extension_css or context is not None:
+        sheets['washi-extensions'] = extension_css
+
+    # json.dumps 生成合法的 JS 字符串，CSS 中的反斜杠与反引号不会破坏脚本
     js = f'''
     (() => {{
-        let style = document.getElementById('washi-theme');
-        if (!style) {{
-            style = document.createElement('style');
-            style.id = 'washi-theme';
-            document.head.appendChild(style);
+        const sheets = {json.dumps(sheets)};
+        for (const [id, css] of Object.entries(sheets)) {{
+            let style = document.getElementById(id);
+            if (!style) {{
+                if (!css) continue;
+                style = document.createElement('style');
+                style.id = id;
+                document.head.appendChild(style);
+            }}
+            style.textContent = css;
         }}
-        style.innerHTML = `{css}`;
     }})()
     '''
 
+    if _tracer.active:
+        js = _wrap_traced_js(js, _tracer.page_request(_describe_target(webview)))
+
+    _instrumentation.record_bytes('update_webview_styles', js)
     try:
         webview.eval(js)
     except Exception:
         pass
 
+# ═══════════════════════════════════════════════════════════════════════════════
+#   SCHEDULER — 任务调度
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class WashiStyleScheduler:
+    """主题任务队列：集合操作（同步、导入、检查数据库等）进行中时暂停非紧急任务，
+    之后在空闲时分片执行"""
+
+    # 每个空闲分片最多占用主线程的时间（毫秒）
+    SLICE_MS = 8
+    # 队列非空时检查空闲的间隔（毫秒）
+    IDLE_INTERVAL_MS = 50
+    # 队列上限，超出时丢弃最早的任务
+    MAX_QUEUE = 64
+
+    def __init__(self):
+        self.queue = OrderedDict()
+        self._blocking = 0
+        self._syncing = False
+        self._timer = None
+        self.deferred = 0
+        self.dropped = 0
+        self.executed = 0
+        self.longest_stall_ms = 0.0
+
+    def busy(self) -> bool:
+        """Anki 是否正在执行集合操作"""
+        if self._blocking or self._syncing:
+            return True
+        progress = getattr(mw, 'progress', None)
+        busy = getattr(progress, 'busy', None)
+        try:
+            return bool(busy()) if busy else False
+        except Exception:
+            return False
+
+    def submit(self, key: object, job, urgent: bool = False) -> None:
+        """提交任务；同一 key 的待执行任务只保留最新一个
+
+        urgent 用于用户直接触发的操作（切换夜间模式、调用 refresh_theme()），
+        即使忙碌也立即执行，并取代队列中同一 key 的任务。
+        """
+        if urgent:
+            if self.queue.pop(key, None) is not None:
+                self.dropped += 1
+            self._run(job)
+            return
+        if not self.queue and not self.busy():
+            self._run(job)
+            return
+        if key in self.queue:
+            del self.queue[key]
+            self.dropped += 1  # 被更新的同类任务取代
+        elif len(self.queue) >= self.MAX_QUEUE:
+            self.queue.popitem(last=False)
+            self.dropped += 1
+        self.queue[key] = job
+        self.deferred += 1
+        self._ensure_timer()
+
+    def _ensure_timer(self) -> None:
+        if self._timer is None:
+            self._timer = QTimer()
+            self._timer.timeout.connect(self.drain)
+        if not self._timer.isActive():
+            self._timer.start(self.IDLE_INTERVAL_MS)
+
+    def drain(self) -> None:
+        """空闲时按分片执行队列中的任务"""
+        if self.busy():
+            return
+        start = time.perf_counter()
+        while self.queue and (time.perf_counter() - start) * 1000 < self.SLICE_MS:
+            _key, job = self.queue.popitem(last=False)
+            self._run(job)
+        if not self.queue and self._timer is not None:
+            self._timer.stop()
+
+    def _run(self, job) -> None:
+        start = time.perf_counter()
+        try:
+            job()
+        finally:
+            self.executed += 1
+            self.longest_stall_ms = max(self.longest_stall_ms, (time.perf_counter() - start) * 1000)
+
+    def on_backend_will_block(self) -> None:
+        self._blocking += 1
+
+    def on_backend_did_block(self) -> None:
+        self._blocking = max(0, self._blocking - 1)
+
+    def on_sync_will_start(self) -> None:
+        self._syncing = True
+
+    def on_sync_did_finish(self) -> None:
+        self._syncing = False
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "queued": len(self.queue),
+            "deferred": self.deferred,
+            "dropped": self.dropped,
+            "executed": self.executed,
+            "longest_stall_ms": self.longest_stall_ms,
+        }
+
+_scheduler = WashiStyleScheduler()
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#   FONTS — 字体
+# ═══════════════════════════════════════════════════════════════════════════════
+
+FONTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+FONT_CACHE_FILE = "font_cache.json"
+
+# Qt 注册的应用字体不会进入 QtWebEngine：网页经 Anki 的 web exports 以 @font-face 加载同一文件
+WEB_FONTS_URL = f"/_addons/{__name__.split('.')[0]}/fonts"
+WEB_FONT_FILES = (
+    ("Inter", "normal", "100 900", "InterVariable.ttf"),
+    ("Inter", "italic", "100 900", "InterVariable-Italic.ttf"),
+)
+
+def _web_font_faces() -> str:
+    """附带字体的 @font-face 规则"""
+    return "".join(
+        f'''
+@font-face {{
+    font-family: "{family}";
+    font-style: {style};
+    font-weight: {weight};
+    font-display: swap;
+    src: url("{WEB_FONTS_URL}/{filename}") format("truetype");
+}}
+'''
+        for family, style, weight, filename in WEB_FONT_FILES
+    )
+
+def _font_families() -> List[str]:
+    """当前可用的字体族（Qt5 的 families() 不是静态方法）"""
+    database = QFontDatabase if qtmajor > 5 else QFontDatabase()
+    return list(database.families())
+
+class WashiFontLoader:
+    """在空闲时注册随插件附带的字体（fonts/ 目录），避免 Qt 反复做回退匹配
+
+    字体文件在后台线程读取，主线程每个空闲时刻只注册一个文件。每个文件的
+    字体族名连同文件大小/修改时间缓存在 user_files/font_cache.json 中，
+    下次启动时，若这些字体族已可用（例如系统已安装），就不再读取该文件。
+    """
+
+    FONT_SUFFIXES = (".ttf", ".otf", ".ttc")
+    # 启动后等待多久再开始加载（毫秒），让主窗口先完成绘制
+    IDLE_DELAY_MS = 500
+
+    def __init__(self, fonts_dir: Optional[str] = None, cache_path: Optional[str] = None):
+        self.fonts_dir = fonts_dir or FONTS_DIR
+        self.cache_path = cache_path or os.path.join(USER_FILES_DIR, FONT_CACHE_FILE)
+        self.font_ids = {}
+        self.families = {}
+        self._cache = {}
+        self._pending = []
+        self._background = True
+
+    def _load_cache(self) -> Dict[str, Dict[str, object]]:
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    def _save_cache(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, "w", encoding="utf-8") as f:
+                json.dump(self._cache, f, indent=1)
+        except OSError:
+            pass
+
+    def _font_files(self) -> List[str]:
+        try:
+            names = os.listdir(self.fonts_dir)
+        except OSError:
+            return []
+        return sorted(n for n in names if n.lower().endswith(self.FONT_SUFFIXES))
+
+    def start(self, delay_ms: Optional[int] = None) -> None:
+        """在空闲时开始加载"""
+        QTimer.singleShot(self.IDLE_DELAY_MS if delay_ms is None else delay_ms, self._scan)
+
+    def load_all_now(self) -> Dict[str, List[str]]:
+        """同步加载全部字体（用于基准测试），返回 文件名 → 字体族"""
+        self._background = False
+        self._scan()
+        return self.families
+
+    def _scan(self) -> None:
+        self._cache = self._load_cache()
+        available = set(_font_families())
+        self._pending = []
+        for name in self._font_files():
+            try:
+                stat = os.stat(os.path.join(self.fonts_dir, name))
+            except OSError:
+                continue
+            entry = self._cache.get(name)
+            if entry and entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime:
+                self.families[name] = entry.get("families", [])
+                if self.families[name] and available.issuperset(self.families[name]):
+                    continue  # 字体族已可用，无需再读取文件
+            self._pending.append((name, stat.st_size, stat.st_mtime))
+        self._next()
+
+    def _next(self) -> None:
+        if not self._pending:
+            self._finish()
+            return
+        name, size, mtime = self._pending.pop(0)
+        path = os.path.join(self.fonts_dir, name)
+
+        def read() -> bytes:
+            with open(path, "rb") as f:
+                return f.read()
+
+        taskman = getattr(mw, 'taskman', None)
+        if self._background and taskman is not None:
+            taskman.run_in_background(read, lambda future: self._on_read(name, size, mtime, future))
+            return
+        try:
+            data = read()
+        except OSError:
+            data = None
+        self._register(name, size, mtime, data)
+
+    def _on_read(self, name: str, size: int, mtime: float, future) -> None:
+        try:
+            data = future.result()
+        except OSError:
+            data = None
+        self._register(name, size, mtime, data)
+
+    def _register(self, name: str, size: int, mtime: float, data: Optional[bytes]) -> None:
+        if data:
+            font_id = QFontDatabase.addApplicationFontFromData(data)
+            if font_id != -1:
+                self.font_ids[name] = font_id
+                self.families[name] = list(QFontDatabase.applicationFontFamilies(font_id))
+                self._cache[name] = {"size": size, "mtime": mtime, "families": self.families[name]}
+        if self._background:
+            QTimer.singleShot(0, self._next)
+        else:
+            self._next()
+
+    def _finish(self) -> None:
+        self._save_cache()
+        if self.font_ids and self._background:
+            # 新字体注册后重新 polish，使已有组件改用真正的字体
+            _scheduler.submit("fonts_loaded", theme_manager_instance.refresh_all)
+
+_font_loader = WashiFontLoader()
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #   EVENT HANDLERS — 事件处理器
 # ═══════════════════════════════════════════════════════════════════════════════
 
+@_instrumented()
 def on_theme_did_change() -> None:
-    """主题切换事件"""
-    theme_manager_instance.refresh_all()
+    """主题切换事件（用户操作，立即执行）"""
+    _scheduler.submit("refresh_all", theme_manager_instance.refresh_all, urgent=True)
 
 def on_webview_did_inject_styles(webview: AnkiWebView) -> None:
     """网页样式注入完成事件"""
-    update_webview_styles(webview)
+    theme_manager_instance.register_webview(webview)
+    _scheduler.submit(("webview", id(webview)), lambda: update_webview_styles(webview))
+
+def on_style_timer() -> None:
+    """定时样式化对话框（忙碌时推迟）"""
+    _scheduler.submit("style_dialog_widgets", style_dialog_widgets)
+
+def on_js_message(handled: Tuple[bool, Any], message: str, context: Any) -> Tuple[bool, Any]:
+    """接收网页回传的 trace 时间点与样式开销"""
+    if message.startswith(WashiTracer.MESSAGE_PREFIX):
+        receiver, prefix = _tracer.page_report, WashiTracer.MESSAGE_PREFIX
+        active = _tracer.active
+    elif message.startswith(WashiPageMonitor.MESSAGE_PREFIX):
+        receiver, prefix = _page_monitor.report, WashiPageMonitor.MESSAGE_PREFIX
+        active = _page_monitor.enabled
+    else:
+        return handled
+    if active:
+        try:
+            payload = json.loads(message[len(prefix):])
+        except ValueError:
+            payload = None
+        # 任何页面（包括卡片模板）都能发送此前缀，只接受对象
+        if isinstance(payload, dict):
+            try:
+                receiver(payload)
+            except (ValueError, KeyError, TypeError):
+                pass
+    return (True, None)
 
+@_instrumented()
 def style_dialog_widgets() -> None:
     """样式化对话框组件"""
     for widget in QApplication.topLevelWidgets():
@@ -868,6 +2226,89 @@ def style_dialog_widgets() -> None:
         elif widget.isWindow() and not isinstance(widget, QMenuBar):
             theme_manager_instance.style_widget(widget)
 
+# ═══════════════════════════════════════════════════════════════════════════════
+#   DEBUG TOOLS — 调试工具
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _format_snapshot(snapshot: Dict[str, Dict[str, object]]) -> str:
+    """将统计快照格式化为文本表格（按累计耗时排序）"""
+    lines = [f"{'hot path':<28}{'calls':>8}{'total ms':>12}{'p95 ms':>10}{'bytes':>12}"]
+    ordered = sorted(snapshot.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+    for name, stat in ordered:
+        lines.append(
+            f"{name:<28}{stat['calls']:>8}{stat['total_ms']:>12.2f}"
+            f"{stat['p95_ms']:>10.3f}{stat['bytes']:>12}"
+        )
+        for target, entry in list(stat["targets"].items())[:5]:
+            lines.append(f"    {target:<24}{entry['calls']:>8}{entry['total_ms']:>12.2f}")
+    return "\n".join(lines)
+
+class WashiStatsDialog(QDialog):
+    """实时显示热路径统计"""
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.setWindowTitle("Washi Theme Stats")
+        self.resize(720, 480)
+
+        self.text = QPlainTextEdit(self)
+        self.text.setReadOnly(True)
+        self.record = QCheckBox("Record", self)
+        self.record.setChecked(_instrumentation.enabled)
+        self.record.toggled.connect(enable_instrumentation)
+        reset = QPushButton("Reset", self)
+        reset.clicked.connect(reset_instrumentation)
+
+        controls = QHBoxLayout()
+        controls.addWidget(self.record)
+        controls.addStretch()
+        controls.addWidget(reset)
+        layout = QVBoxLayout(self)
+        layout.addLayout(controls)
+        layout.addWidget(self.text)
+
+        # 只在窗口可见时刷新
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event) -> None:
+        self.refresh()
+        self.timer.start(1000)
+        super().showEvent(event)
+
+    def hideEvent(self, event) -> None:
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self) -> None:
+        scheduler = "  ".join(f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}"
+                              for k, v in get_scheduler_stats().items())
+        self.text.setPlainText(
+            _format_snapshot(get_instrumentation_snapshot()) + f"\n\nscheduler  {scheduler}"
+        )
+
+_stats_dialog: Optional[WashiStatsDialog] = None
+
+def show_stats_dialog() -> None:
+    """打开统计窗口（复用同一个实例）"""
+    global _stats_dialog
+    if _stats_dialog is None or sip.isdeleted(_stats_dialog):
+        _stats_dialog = WashiStatsDialog(mw)
+    _stats_dialog.show()
+    _stats_dialog.raise_()
+    _stats_dialog.activateWindow()
+
+def _on_trace_toggled(checked: bool) -> None:
+    """菜单切换 trace 记录"""
+    if checked:
+        start_tracing()
+    else:
+        tooltip(f"Trace written to {stop_tracing()}")
+
+def _on_page_monitor_toggled(checked: bool) -> None:
+    """菜单切换网页样式预算监控"""
+    _page_monitor.enabled = checked
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #   INITIALIZATION — 初始化
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -888,9 +2329,41 @@ if mw:
     # 定时样式化对话框
     style_timer = QTimer()
     if qtmajor > 5:
-        style_timer.timeout.connect(style_dialog_widgets)
+        style_timer.timeout.connect(on_style_timer)
         style_timer.start(2500)
 
+    # 调试菜单
+    if hasattr(mw, 'form') and hasattr(mw.form, 'menuTools'):
+        stats_action = QAction("Washi Theme Stats", mw)
+        stats_action.triggered.connect(show_stats_dialog)
+        mw.form.menuTools.addAction(stats_action)
+
+        trace_action = QAction("Washi Theme Trace", mw)
+        trace_action.setCheckable(True)
+        trace_action.toggled.connect(_on_trace_toggled)
+        mw.form.menuTools.addAction(trace_action)
+
+        monitor_action = QAction("Washi Page Budget Monitor", mw)
+        monitor_action.setCheckable(True)
+        monitor_action.toggled.connect(_on_page_monitor_toggled)
+        mw.form.menuTools.addAction(monitor_action)
+
+    gui_hooks.webview_did_receive_js_message.append(on_js_message)
+
+    # 集合操作期间暂停非紧急样式任务
+    gui_hooks.backend_will_block.append(_scheduler.on_backend_will_block)
+    gui_hooks.backend_did_block.append(_scheduler.on_backend_did_block)
+    gui_hooks.sync_will_start.append(_scheduler.on_sync_will_start)
+    gui_hooks.sync_did_finish.append(_scheduler.on_sync_did_finish)
+
+    # 调色板热加载
+    theme_manager_instance.watch_palette_file()
+
+    # 空闲时注册附带字体；同一文件供网页 @font-face 使用
+    if hasattr(mw, 'addonManager'):
+        mw.addonManager.setWebExports(__name__, r"fonts/.*\.(ttf|otf)")
+    _font_loader.start()
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #   PUBLIC API — 公共接口
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -899,12 +2372,91 @@ def apply_style(widget: QWidget) -> None:
     """应用和纸主题到指定组件"""
     theme_manager_instance.style_widget(widget)
 
+def apply_style_batch(widgets: Iterable[QWidget]) -> int:
+    """批量应用和纸主题：只对最外层的组件应用一次，返回重新应用的组件数"""
+    return theme_manager_instance.style_widgets(widgets)
+
+@contextmanager
+def style_batch() -> Iterator[List[QWidget]]:
+    """收集组件，在 with 块结束时批量应用主题
+
+    with style_batch() as batch:
+        batch.append(dialog)
+        batch.extend(dialog.findChildren(QWidget))
+    """
+    widgets = []
+    yield widgets
+    theme_manager_instance.style_widgets(widgets)
+
+def exclude_from_theme(widget: QWidget, excluded: bool = True) -> None:
+    """标记组件（或窗口）不使用和纸主题，也不从已样式化的祖先继承"""
+    theme_manager_instance.exclude(widget, excluded)
+
+def register_style_fragment(contributor: str, target: str, css: str, kind: str = "qss") -> None:
+    """注册扩展样式片段（QSS 以组件类为键，网页以页面上下文为键，用 $token 引用调色板）
+
+    register_style_fragment("my-addon", "QTableView::item:selected",
+                            "background: $vermilion_pale; color: $vermilion;")
+    register_style_fragment("my-addon", "Reviewer", ".hint { color: $ink_tertiary; }", kind="web")
+    """
+    _style_registry.register(contributor, target, css, kind)
+    theme_manager_instance.reload_extensions()
+
+def unregister_style_fragments(contributor: str) -> None:
+    """移除某个贡献者的全部样式片段"""
+    _style_registry.unregister(contributor)
+    theme_manager_instance.reload_extensions()
+
+def get_style_registry_report() -> Dict[str, object]:
+    """各贡献者编译后的样式大小与冲突列表"""
+    return _style_registry.report(theme_manager_instance.colors)
+
 def refresh_theme() -> None:
-    """刷新主题"""
-    theme_manager_instance.refresh_all()
+    """刷新主题（立即执行，并取代队列中等待的刷新）"""
+    _scheduler.submit("refresh_all", theme_manager_instance.refresh_all, urgent=True)
 
 def get_colors() -> Dict[str, str]:
     """获取当前主题颜色"""
     return theme_manager_instance.colors
 
-__all__ = ['apply_style', 'refresh_theme', 'get_colors', 'WashiThemeManager']
+def enable_instrumentation(enabled: bool = True) -> None:
+    """开启或关闭热路径统计"""
+    _instrumentation.enabled = enabled
+
+def reset_instrumentation() -> None:
+    """清空热路径统计"""
+    _instrumentation.reset()
+
+def get_instrumentation_snapshot() -> Dict[str, Dict[str, object]]:
+    """获取热路径统计快照（调用次数、累计/p95 耗时、字节数、涉及的组件）"""
+    return _instrumentation.snapshot()
+
+def start_tracing() -> None:
+    """开始记录主题切换与页面注入的时间线"""
+    _tracer.start()
+
+def stop_tracing(path: Optional[str] = None) -> str:
+    """停止记录并写出 Chrome trace-event JSON，返回文件路径"""
+    if path is None:
+        path = os.path.join(USER_FILES_DIR, f"washi-trace-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    return _tracer.stop(path)
+
+def enable_page_monitor(enabled: bool = True) -> None:
+    """开启或关闭网页样式预算监控（对之后加载的页面生效）"""
+    _page_monitor.enabled = enabled
+
+def get_scheduler_stats() -> Dict[str, object]:
+    """获取任务调度统计（推迟/丢弃的任务数与最长主线程占用）"""
+    return _scheduler.stats()
+
+def get_loaded_fonts() -> Dict[str, List[str]]:
+    """获取已注册（或经缓存确认已可用）的附带字体：文件名 → 字体族"""
+    return dict(_font_loader.families)
+
+__all__ = [
+    'apply_style', 'apply_style_batch', 'style_batch', 'exclude_from_theme', 'refresh_theme', 'get_colors', 'WashiThemeManager',
+    'enable_instrumentation', 'reset_instrumentation', 'get_instrumentation_snapshot',
+    'start_tracing', 'stop_tracing', 'enable_page_monitor', 'get_scheduler_stats',
+    'get_loaded_fonts',
+    'register_style_fragment', 'unregister_style_fragments', 'get_style_registry_report',
+]
@@ -0,0 +1,190 @@
+"""
+Minimal stand-in for the ``aqt`` package so the add-on can be imported
+outside Anki. Only the names the add-on touches exist: ``gui_hooks``,
+``mw``, ``theme_manager``, a fake ``AnkiWebView`` and the Qt re-exports.
+
+With PyQt6 installed, call ``make_app()`` and ``make_main_window()``
+before ``install(mw)`` so the add-on styles a real (offscreen) window.
+``load_addon()`` then stops the work the add-on schedules at startup and
+points its ``user_files`` at a temporary directory, so nothing runs inside
+timed regions or writes into the repository.
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import types
+from pathlib import Path
+
+ADDON_ROOT = Path(__file__).resolve().parent.parent
+
+
+class _Hook(list):
+    """gui_hooks 中的单个钩子：可 append，也可直接调用"""
+
+    def __call__(self, *args):
+        for callback in list(self):
+            callback(*args)
+
+
+class _GuiHooks:
+    def __getattr__(self, name: str) -> _Hook:
+        hook = _Hook()
+        setattr(self, name, hook)
+        return hook
+
+
+class _ThemeManager:
+    night_mode = False
+
+
+class WebContent:
+    def __init__(self) -> None:
+        self.head = ""
+        self.body = ""
+
+
+class AnkiWebView:
+    """记录 eval 调用的伪网页视图"""
+
+    def __init__(self, kind: str = "main") -> None:
+        self.kind = kind
+        self.evaluated = []
+
+    def eval(self, js: str) -> None:
+        self.evaluated.append(js)
+
+
+class DeckBrowser:
+    pass
+
+
+def _qt_module() -> types.ModuleType:
+    qt = types.ModuleType("aqt.qt")
+    try:
+        from PyQt6 import QtCore, QtGui, QtWidgets, sip
+        qt.qtmajor = 6
+    except ImportError:
+        QtCore = QtGui = QtWidgets = sip = None
+        qt.qtmajor = 0
+
+    if QtWidgets is not None:
+        for module in (QtCore, QtGui, QtWidgets):
+            for name in dir(module):
+                if name.startswith("Q"):
+                    setattr(qt, name, getattr(module, name))
+        qt.sip = sip
+    else:
+        # 无 Qt 时按需生成占位类，足以加载 CSS 生成函数
+        def placeholder(name: str) -> type:
+            if not name.startswith("Q"):
+                raise AttributeError(name)
+            cls = type(name, (), {})
+            setattr(qt, name, cls)
+            return cls
+
+        qt.__getattr__ = placeholder
+        qt.sip = types.SimpleNamespace(isdeleted=lambda obj: False)
+    return qt
+
+
+def make_app():
+    """创建（或复用）离屏 QApplication"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtCore import qInstallMessageHandler
+    from PyQt6.QtWidgets import QApplication
+
+    def quiet(mode, context, message: str) -> None:
+        # 离屏插件对每个窗口都会打印此警告
+        if "propagateSizeHints" not in message:
+            sys.stderr.write(message + "\n")
+
+    qInstallMessageHandler(quiet)
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+
+def make_main_window():
+    """带 form.menubar / form.menuTools 的伪主窗口"""
+    from PyQt6.QtWidgets import QMainWindow, QMenuBar
+
+    mw = QMainWindow()
+    mw.setObjectName("MainWindow")
+    menubar = QMenuBar(mw)
+    mw.setMenuBar(menubar)
+    mw.form = types.SimpleNamespace(menubar=menubar, menuTools=menubar.addMenu("Tools"))
+    return mw
+
+
+def install(mw=None) -> types.ModuleType:
+    """注册伪 aqt 模块到 sys.modules"""
+    aqt = types.ModuleType("aqt")
+    aqt.__path__ = []
+    aqt.gui_hooks = _GuiHooks()
+    aqt.mw = mw
+
+    theme = types.ModuleType("aqt.theme")
+    theme.theme_manager = _ThemeManager()
+
+    webview = types.ModuleType("aqt.webview")
+    webview.WebContent = WebContent
+    webview.AnkiWebView = AnkiWebView
+
+    deckbrowser = types.ModuleType("aqt.deckbrowser")
+    deckbrowser.DeckBrowser = DeckBrowser
+
+    colors = types.ModuleType("aqt.colors")
+
+    utils = types.ModuleType("aqt.utils")
+    utils.tooltip = lambda *args, **kwargs: None
+
+    modules = {
+        "aqt": aqt,
+        "aqt.qt": _qt_module(),
+        "aqt.theme": theme,
+        "aqt.webview": webview,
+        "aqt.deckbrowser": deckbrowser,
+        "aqt.colors": colors,
+        "aqt.utils": utils,
+    }
+    for name, module in modules.items():
+        sys.modules[name] = module
+        if "." in name:
+            setattr(aqt, name.split(".", 1)[1], module)
+    return aqt
+
+
+def load_addon(name: str = "washi_theme") -> types.ModuleType:
+    """以包的形式导入未修改的插件"""
+    spec = importlib.util.spec_from_file_location(
+        name, ADDON_ROOT / "__init__.py",
+        submodule_search_locations=[str(ADDON_ROOT)],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    isolate(module)
+    return module
+
+
+def isolate(washi: types.ModuleType) -> str:
+    """停止插件启动时安排的后台工作，并将 user_files 指向临时目录"""
+    user_files = tempfile.mkdtemp(prefix="washi-user-files-")
+    washi.USER_FILES_DIR = user_files
+
+    timer = getattr(washi, "style_timer", None)
+    if timer is not None:
+        timer.stop()
+
+    # 启动时安排的字体加载会扫描这个空目录，不注册任何字体
+    washi._font_loader.fonts_dir = user_files
+    washi._font_loader.cache_path = os.path.join(user_files, washi.FONT_CACHE_FILE)
+
+    manager = washi.theme_manager_instance
+    manager.palette_store = washi.WashiPaletteStore(os.path.join(user_files, washi.PALETTE_FILE))
+    watcher = manager._palette_watcher
+    if watcher is not None:
+        paths = watcher.files() + watcher.directories()
+        if paths:
+            watcher.removePaths(paths)
+    return user_files
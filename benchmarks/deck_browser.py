@@ -0,0 +1,217 @@
+"""
+Deck browser benchmark — 牌组列表性能测试
+
+Generates deck-list pages shaped like Anki's deck browser at 1k, 5k and
+20k rows, once with the plain washi web sheet and once with the deck
+browser scaling sheet, and measures:
+
+    initial   navigation start → first frame painted with the full tree
+    collapse  replace the tree with the first top-level deck collapsed
+    expand    replace it again with the full tree
+
+Usage:
+    python benchmarks/deck_browser.py [--out DIR] [--rows 1000 5000 20000]
+
+With PyQt6-WebEngine installed the pages are run headless (set
+QT_QPA_PLATFORM=offscreen on servers) and a JSON summary is printed.
+Otherwise the pages are only written to --out; open them in a Chromium
+based browser and the numbers are shown on the page.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import _aqt_stub  # noqa: E402
+
+_aqt_stub.install()
+washi = _aqt_stub.load_addon()
+
+CHILDREN_PER_DECK = 4
+REPEATS = 5
+
+_ROW_JS = r"""
+function washiRow(id, name, depth, hasChildren, collapsed) {
+    const pad = depth * 20;
+    const toggle = hasChildren
+        ? `<a class=collapse href=# onclick='return false'>${collapsed ? "+" : "-"}</a>`
+        : `<span class=collapse></span>`;
+    return `<tr class='deck' id='${id}'>` +
+        `<td class=decktd colspan=5><span style='padding-left:${pad}px'>${toggle}` +
+        `<a class=deck href=# onclick='return false'>${name}</a></span></td>` +
+        `<td align=end><a class=new-count>${id % 20}</a></td>` +
+        `<td align=end><a class=review-count>${id % 50}</a></td>` +
+        `<td align=center class=opts><a onclick='return false'>` +
+        `<span class=gears>⚙</span></a></td></tr>`;
+}
+
+function washiTree(total, perDeck, collapseFirst) {
+    const out = [];
+    let id = 1;
+    for (let top = 0; id <= total; top++) {
+        const collapsed = collapseFirst && top === 0;
+        out.push(washiRow(id, `Deck ${top}`, 0, true, collapsed));
+        id++;
+        for (let c = 0; c < perDeck && id <= total; c++, id++) {
+            if (!collapsed) out.push(washiRow(id, `Deck ${top}::Sub ${c}`, 1, false, false));
+        }
+    }
+    return out.join("");
+}
+"""
+
+_DRIVER_JS = r"""
+function nextFrame() {
+    return new Promise(resolve => requestAnimationFrame(() => setTimeout(resolve, 0)));
+}
+
+async function washiReplace(html) {
+    const tbody = document.getElementById("decktree-body");
+    const t0 = performance.now();
+    tbody.innerHTML = html;
+    document.body.offsetHeight;
+    await nextFrame();
+    return performance.now() - t0;
+}
+
+window.addEventListener("load", async () => {
+    await nextFrame();
+    const initial = performance.now();
+    const full = washiTree(ROWS, PER_DECK, false);
+    const collapsedHtml = washiTree(ROWS, PER_DECK, true);
+    const collapse = [], expand = [];
+    for (let i = 0; i < REPEATS; i++) {
+        collapse.push(await washiReplace(collapsedHtml));
+        expand.push(await washiReplace(full));
+    }
+    window.__washiBench = {initial, collapse, expand};
+    const report = document.createElement("pre");
+    report.textContent = JSON.stringify(window.__washiBench, null, 2);
+    document.body.prepend(report);
+});
+"""
+
+
+def _deck_rows(total: int) -> str:
+    """生成与 Anki 牌组列表结构一致的初始 HTML"""
+    rows = []
+    deck_id = 1
+    top = 0
+    while deck_id <= total:
+        rows.append(_row(deck_id, f"Deck {top}", 0, True))
+        deck_id += 1
+        for child in range(CHILDREN_PER_DECK):
+            if deck_id > total:
+                break
+            rows.append(_row(deck_id, f"Deck {top}::Sub {child}", 1, False))
+            deck_id += 1
+        top += 1
+    return "".join(rows)
+
+
+def _row(deck_id: int, name: str, depth: int, has_children: bool) -> str:
+    toggle = (
+        "<a class=collapse href=# onclick='return false'>-</a>"
+        if has_children else "<span class=collapse></span>"
+    )
+    return (
+        f"<tr class='deck' id='{deck_id}'>"
+        f"<td class=decktd colspan=5><span style='padding-left:{depth * 20}px'>{toggle}"
+        f"<a class=deck href=# onclick='return false'>{name}</a></span></td>"
+        f"<td align=end><a class=new-count>{deck_id % 20}</a></td>"
+        f"<td align=end><a class=review-count>{deck_id % 50}</a></td>"
+        f"<td align=center class=opts><a onclick='return false'>"
+        f"<span class=gears>⚙</span></a></td></tr>"
+    )
+
+
+def build_page(rows: int, scaling: bool) -> str:
+    colors = washi.WASHI_COLORS_LIGHT
+    styles = f'<style id="washi-theme">{washi._get_web_css(colors)}</style>'
+    if scaling:
+        styles += f'<style id="washi-deck-browser">{washi._get_deck_browser_css(colors)}</style>'
+    return f"""<!doctype html>
+<html><head><meta charset="utf-8">{styles}</head>
+<body><center><table cellspacing=0 cellpadding=3>
+<tr><th colspan=5 align=start>Deck</th><th>New</th><th>Due</th><th></th></tr>
+<tbody id="decktree-body">{_deck_rows(rows)}</tbody>
+</table></center>
+<script>
+const ROWS = {rows}, PER_DECK = {CHILDREN_PER_DECK}, REPEATS = {REPEATS};
+{_ROW_JS}
+{_DRIVER_JS}
+</script></body></html>"""
+
+
+def _run_webengine(pages: dict) -> dict:
+    from PyQt6.QtCore import QEventLoop, QTimer, QUrl
+    from PyQt6.QtWebEngineCore import QWebEnginePage
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = {}
+    for key, path in pages.items():
+        page = QWebEnginePage()
+        loop = QEventLoop()
+        found = {}
+
+        def poll() -> None:
+            def done(value) -> None:
+                if value:
+                    found["value"] = json.loads(value)
+                    loop.quit()
+                else:
+                    QTimer.singleShot(100, poll)
+            page.runJavaScript("JSON.stringify(window.__washiBench || null)", done)
+
+        page.loadFinished.connect(lambda ok: poll())
+        page.load(QUrl.fromLocalFile(str(path)))
+        loop.exec()
+        results[key] = found["value"]
+        page.deleteLater()
+    app.processEvents()
+    return results
+
+
+def _summarize(raw: dict) -> dict:
+    return {
+        "initial_ms": round(raw["initial"], 2),
+        "collapse_ms": round(statistics.median(raw["collapse"]), 2),
+        "expand_ms": round(statistics.median(raw["expand"]), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--out", type=Path, default=None)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000, 20000])
+    args = parser.parse_args()
+
+    out = args.out or Path(tempfile.mkdtemp(prefix="washi-deck-bench-"))
+    out.mkdir(parents=True, exist_ok=True)
+
+    pages = {}
+    for rows in args.rows:
+        for scaling in (False, True):
+            key = f"{rows}-{'scaling' if scaling else 'default'}"
+            path = out / f"deck-browser-{key}.html"
+            path.write_text(build_page(rows, scaling), encoding="utf-8")
+            pages[key] = path
+
+    try:
+        raw = _run_webengine(pages)
+    except ImportError:
+        print(f"PyQt6-WebEngine not available; pages written to {out}")
+        for path in pages.values():
+            print(f"  {path}")
+        return
+
+    print(json.dumps({key: _summarize(value) for key, value in raw.items()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Font registration benchmark — 字体注册前后的排版耗时
+
+Builds a text-heavy dialog (paragraph labels, a form and a filled table)
+styled with the washi global sheet and times its layout, once in a process
+where the bundled fonts are not registered and once after
+WashiFontLoader.load_all_now(). Each mode runs in its own process so Qt's
+font caches start cold in both. Also reports how long registration itself
+takes, cold and with a warm font_cache.json.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python benchmarks/fonts.py [--fonts-dir fonts] [--repeats 10]
+
+Needs PyQt6. Without font files in --fonts-dir both modes measure the same.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import _aqt_stub  # noqa: E402
+
+PARAGRAPH = (
+    "和紙 washi paper is made from the inner bark of the kozo shrub. "
+    "The fibres are long, so the sheet stays strong while remaining thin. "
+) * 4
+
+
+def _dialog(washi):
+    from PyQt6.QtWidgets import (
+        QDialog, QFormLayout, QLabel, QLineEdit, QTableWidget, QTableWidgetItem, QVBoxLayout,
+    )
+
+    dialog = QDialog()
+    layout = QVBoxLayout(dialog)
+    for index in range(12):
+        label = QLabel(f"{index}. {PARAGRAPH}")
+        label.setWordWrap(True)
+        layout.addWidget(label)
+    form = QFormLayout()
+    for index in range(10):
+        form.addRow(f"Field {index} 項目", QLineEdit(PARAGRAPH[:60]))
+    layout.addLayout(form)
+    table = QTableWidget(60, 4)
+    for row in range(60):
+        for column in range(4):
+            table.setItem(row, column, QTableWidgetItem(PARAGRAPH[column * 20:column * 20 + 40]))
+    layout.addWidget(table)
+    washi.theme_manager_instance.style_widget(dialog)
+    return dialog
+
+
+def _measure(mode: str, fonts_dir: str, repeats: int) -> dict:
+    app = _aqt_stub.make_app()
+    _aqt_stub.install(_aqt_stub.make_main_window())
+    washi = _aqt_stub.load_addon()
+
+    result = {"mode": mode, "families": []}
+    if mode == "with":
+        cache = Path(tempfile.mkdtemp(prefix="washi-fonts-")) / washi.FONT_CACHE_FILE
+        start = time.perf_counter()
+        loader = washi.WashiFontLoader(fonts_dir, str(cache))
+        loader.load_all_now()
+        result["register_cold_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        result["families"] = sorted({f for families in loader.families.values() for f in families})
+        # 第二个加载器读取缓存：已注册的字体族不会再读取文件
+        start = time.perf_counter()
+        washi.WashiFontLoader(fonts_dir, str(cache)).load_all_now()
+        result["register_cached_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+    samples = []
+    for _ in range(repeats):
+        dialog = _dialog(washi)
+        start = time.perf_counter()
+        dialog.show()
+        dialog.layout().activate()
+        app.processEvents()
+        samples.append((time.perf_counter() - start) * 1000)
+        dialog.close()
+        dialog.deleteLater()
+        app.processEvents()
+    result["first_layout_ms"] = round(samples[0], 2)
+    result["median_layout_ms"] = round(statistics.median(samples), 2)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fonts-dir", default=str(_aqt_stub.ADDON_ROOT / "fonts"))
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--mode", choices=("with", "without"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(_measure(args.mode, args.fonts_dir, args.repeats)))
+        return
+
+    results = {}
+    for mode in ("without", "with"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode,
+             "--fonts-dir", args.fonts_dir, "--repeats", str(args.repeats)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
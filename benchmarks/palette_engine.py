@@ -0,0 +1,99 @@
+"""
+Palette engine benchmark — 调色板生成性能
+
+Derives light and dark palettes from random seed colors, validates every
+candidate against CONTRAST_REQUIREMENTS and reports candidates per second,
+cold (cache cleared) and warm. Also checks that derived palettes have the
+same keys as get_colors() and how far the default seeds drift from the
+hand-tuned WASHI_COLORS_LIGHT / WASHI_COLORS_DARK.
+
+Usage:
+    python benchmarks/palette_engine.py [--candidates 1000] [--min-rate 200]
+
+Exits with status 1 when the cold rate falls below --min-rate.
+"""
+
+import argparse
+import colorsys
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import _aqt_stub  # noqa: E402
+
+_aqt_stub.install()
+washi = _aqt_stub.load_addon()
+
+
+def _random_hex(rng: random.Random, lightness: float, saturation: float) -> str:
+    r, g, b = colorsys.hls_to_rgb(rng.random(), lightness, saturation)
+    return "#{:02X}{:02X}{:02X}".format(round(r * 255), round(g * 255), round(b * 255))
+
+
+def _seeds(count: int) -> list:
+    rng = random.Random(1)
+    return [
+        (
+            _random_hex(rng, rng.uniform(0.35, 0.55), rng.uniform(0.4, 0.8)),
+            _random_hex(rng, rng.uniform(0.94, 0.98), rng.uniform(0.1, 0.4)),
+            _random_hex(rng, rng.uniform(0.08, 0.15), rng.uniform(0.0, 0.1)),
+        )
+        for _ in range(count)
+    ]
+
+
+def _rate(seeds: list) -> tuple:
+    failing = 0
+    start = time.perf_counter()
+    for accent, paper, ink in seeds:
+        washi.derive_palettes(accent, paper, ink)
+        if washi.derived_contrast_failures(accent, paper, ink):
+            failing += 1
+    return len(seeds) / (time.perf_counter() - start), failing
+
+
+def _drift() -> int:
+    """默认种子生成的调色板与手调色板之间的最大通道差"""
+    derived = washi.derive_palettes()
+    worst = 0
+    for mode, reference in (("light", washi.WASHI_COLORS_LIGHT), ("dark", washi.WASHI_COLORS_DARK)):
+        for token, color in reference.items():
+            if color.startswith("#"):
+                a, b = color.lstrip("#"), derived[mode][token].lstrip("#")
+                worst = max(worst, *(abs(int(a[i:i + 2], 16) - int(b[i:i + 2], 16)) for i in (0, 2, 4)))
+    return worst
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--candidates", type=int, default=1000)
+    parser.add_argument("--min-rate", type=float, default=200.0)
+    args = parser.parse_args()
+
+    derived = washi.derive_palettes()
+    for mode, reference in (("light", washi.WASHI_COLORS_LIGHT), ("dark", washi.WASHI_COLORS_DARK)):
+        if set(derived[mode]) != set(reference):
+            print(f"{mode} palette keys differ: {set(derived[mode]) ^ set(reference)}")
+            return 1
+
+    seeds = _seeds(args.candidates)
+    washi._derive_tables.cache_clear()
+    cold, failing = _rate(seeds)
+    warm, _ = _rate(seeds)
+
+    print(f"candidates          {args.candidates}")
+    print(f"cold                {cold:,.0f} palettes/s")
+    print(f"warm (cached)       {warm:,.0f} palettes/s")
+    print(f"failing contrast    {failing}")
+    print(f"default seed drift  {_drift()} / 255 per channel")
+
+    if cold < args.min_rate:
+        print(f"FAIL cold rate below {args.min_rate:.0f} palettes/s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Palette hot-reload benchmark — 调色板热加载延迟
+
+Edits a palette file watched by the add-on and measures the time from the
+file save to the restyled UI (QFileSystemWatcher notification, debounce,
+palette diff, section recompilation and setStyleSheet on affected widgets).
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python benchmarks/palette_reload.py [--windows 20]
+
+Needs PyQt6.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import _aqt_stub  # noqa: E402
+
+# 只被少数样式段使用的令牌与几乎处处使用的令牌
+TOKENS = ("ink_faint", "vermilion_pale", "paper_primary")
+EDITS = 10
+TIMEOUT_S = 2.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--windows", type=int, default=20)
+    args = parser.parse_args()
+
+    app = _aqt_stub.make_app()
+    _aqt_stub.install(_aqt_stub.make_main_window())
+    washi = _aqt_stub.load_addon()
+    from PyQt6.QtWidgets import QLineEdit, QPushButton, QVBoxLayout, QWidget
+
+    manager = washi.theme_manager_instance
+    path = Path(tempfile.mkdtemp(prefix="washi-palette-")) / washi.PALETTE_FILE
+    path.write_text("{}", encoding="utf-8")
+    manager.palette_store = washi.WashiPaletteStore(str(path))
+    manager.palette_store.load()
+    manager.watch_palette_file()
+
+    windows = []
+    for _ in range(args.windows):
+        window = QWidget()
+        layout = QVBoxLayout(window)
+        for index in range(20):
+            layout.addWidget(QPushButton(f"button {index}") if index % 2 else QLineEdit())
+        window.show()
+        manager.style_widget(window)
+        windows.append(window)
+    app.processEvents()
+
+    results = {}
+    for token in TOKENS:
+        latencies = []
+        sections = []
+        for edit in range(EDITS):
+            manager.last_palette_reload = None
+            value = f"#{(edit * 0x111111 + 0x203040) & 0xFFFFFF:06X}"
+            saved = time.perf_counter()
+            path.write_text(json.dumps({"light": {token: value}}), encoding="utf-8")
+            while manager.last_palette_reload is None:
+                app.processEvents()
+                if time.perf_counter() - saved > TIMEOUT_S:
+                    raise SystemExit(f"no reload within {TIMEOUT_S}s for {token}")
+                time.sleep(0.0005)
+            app.processEvents()
+            latencies.append((time.perf_counter() - saved) * 1000)
+            sections = manager.last_palette_reload["sections"]
+        results[token] = {
+            "sections": sections,
+            "median_ms": round(statistics.median(latencies), 2),
+            "max_ms": round(max(latencies), 2),
+            "debounce_ms": manager.PALETTE_RELOAD_DELAY_MS,
+        }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
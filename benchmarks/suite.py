@@ -0,0 +1,342 @@
+"""
+Headless benchmark suite — 无界面性能测试
+
+Imports the add-on unmodified on top of the stand-in ``aqt`` module and an
+offscreen Qt application, then times the styling hot paths:
+
+    css_generation/*        every CSS generator, light and dark
+    style_widget/<n>        style_widget on a synthetic tree of n children
+    refresh_all/<n>         refresh_all with n registered windows
+    theme_toggle/<n>        night-mode switch through gui_hooks.theme_did_change
+    style_dialog_widgets/<n>  the polling scan with n open top-level windows
+    apply_style_each/<n>    apply_style on each of n widgets in one dialog
+    apply_style_batch/<n>   apply_style_batch on the same widgets
+    apply_style_batch_themed/<n>  apply_style_batch on the children of an already-themed window
+    exclude_in_main_window  exclude_from_theme on a widget inside the main window; also checks
+                            that the menubar sheet and a sibling's own sheet survive
+    webview/*               inject_washi_styles and update_webview_styles
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python benchmarks/suite.py --save benchmarks/baselines/main.json
+    python benchmarks/suite.py --compare benchmarks/baselines/main.json
+
+``--compare`` exits with status 1 when a benchmark's median is slower than
+the baseline by more than its threshold (``--threshold``, or a per-name
+override in the baseline's ``thresholds`` table).
+
+Widget benchmarks need PyQt6; without it only the Qt-free ones run.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import _aqt_stub  # noqa: E402
+
+TREE_SIZES = (50, 200, 1000)
+WINDOW_COUNTS = (1, 10, 50)
+
+# 忽略绝对差值小于此值的“回退”（毫秒），避免微基准噪声
+MIN_DELTA_MS = 0.05
+
+
+def _time(func, repeats: int, setup=None) -> dict:
+    samples = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "runs": repeats,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_aqt_stub.ADDON_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class Suite:
+    def __init__(self, repeats: int):
+        self.repeats = repeats
+        self.results = {}
+        self.failures = []
+        try:
+            self.app = _aqt_stub.make_app()
+            mw = _aqt_stub.make_main_window()
+        except ImportError:
+            self.app = mw = None
+        self.aqt = _aqt_stub.install(mw)
+        self.washi = _aqt_stub.load_addon()
+
+    def run(self, name: str, func, setup=None, repeats=None) -> None:
+        self.results[name] = _time(func, repeats or self.repeats, setup)
+        print(f"{name:<36}{self.results[name]['median_ms']:>10.3f} ms")
+
+    def _process_events(self) -> None:
+        if self.app is not None:
+            self.app.processEvents()
+
+    def bench_css_generation(self) -> None:
+        washi = self.washi
+        generators = [
+            washi._get_menu_bar_css, washi._get_menu_dropdown_css,
+            washi._get_global_css, washi._get_web_css, washi._get_deck_browser_css,
+        ]
+        for label, colors in (("light", washi.WASHI_COLORS_LIGHT), ("dark", washi.WASHI_COLORS_DARK)):
+            for generator in generators:
+                name = generator.__name__.strip("_").replace("get_", "").replace("_css", "")
+                self.run(f"css_generation/{name}/{label}", lambda g=generator, c=colors: g(c))
+
+    def bench_webview(self) -> None:
+        washi = self.washi
+        webview = self.aqt.webview.AnkiWebView()
+        self.run(
+            "webview/inject_washi_styles",
+            lambda: washi.inject_washi_styles(self.aqt.webview.WebContent(), None),
+        )
+        self.run(
+            "webview/inject_deck_browser",
+            lambda: washi.inject_washi_styles(
+                self.aqt.webview.WebContent(), self.aqt.deckbrowser.DeckBrowser()
+            ),
+        )
+        self.run("webview/update_webview_styles", lambda: washi.update_webview_styles(webview))
+
+    def _tree(self, size: int):
+        from PyQt6.QtWidgets import QLabel, QLineEdit, QPushButton, QVBoxLayout, QWidget
+
+        root = QWidget()
+        layout = QVBoxLayout(root)
+        kinds = (QPushButton, QLineEdit, QLabel)
+        for index in range(size):
+            layout.addWidget(kinds[index % len(kinds)](f"item {index}"))
+        root.show()
+        self._process_events()
+        return root
+
+    def _windows(self, count: int) -> list:
+        windows = [self._tree(20) for _ in range(count)]
+        for window in windows:
+            window.setWindowTitle("dialog")
+        return windows
+
+    def _close(self, widgets: list) -> None:
+        manager = self.washi.theme_manager_instance
+        sip = self.aqt.qt.sip
+        for widget in widgets:
+            manager.styled_widgets.pop(widget, None)
+        # 不在事件循环中，deleteLater 不会生效：直接删除，避免残留的顶层窗口
+        # 被之后的 refresh_all / style_dialog_widgets 计入
+        for widget in widgets:
+            if not sip.isdeleted(widget):
+                widget.close()
+                sip.delete(widget)
+        self._process_events()
+
+    def bench_style_widget(self) -> None:
+        manager = self.washi.theme_manager_instance
+        for size in TREE_SIZES:
+            root = self._tree(size)
+
+            def style(root=root) -> None:
+                manager.style_widget(root)
+                self._process_events()
+
+            self.run(f"style_widget/{size}", style, setup=lambda root=root: root.setStyleSheet(""))
+            self._close([root])
+
+    def bench_batch(self) -> None:
+        washi = self.washi
+        from PyQt6.QtWidgets import QWidget
+
+        for size in TREE_SIZES[:2]:
+            root = self._tree(size)
+            # 与构建对话框时一样，批次包含对话框本身及其子组件
+            children = [root, *root.findChildren(QWidget)]
+
+            def reset(children=children) -> None:
+                for widget in children:
+                    widget.setStyleSheet("")
+
+            def one_by_one(children=children) -> None:
+                for widget in children:
+                    washi.apply_style(widget)
+                self._process_events()
+
+            def batch(children=children) -> None:
+                washi.apply_style_batch(children)
+                self._process_events()
+
+            def themed(children=children) -> None:
+                washi.apply_style_batch(children[1:])
+                self._process_events()
+
+            self.run(f"apply_style_each/{size}", one_by_one, setup=reset, repeats=3)
+            self.run(f"apply_style_batch/{size}", batch, setup=reset)
+            # 窗口已带有当前样式表：子组件不应再各自解析一次
+            def themed_setup(root=root) -> None:
+                reset()
+                washi.apply_style(root)
+                self._process_events()
+
+            self.run(f"apply_style_batch_themed/{size}", themed, setup=themed_setup)
+            reset()
+            washi.apply_style(root)
+            restyled = washi.apply_style_batch(children[1:])
+            if restyled:
+                self.failures.append(f"apply_style_batch restyled {restyled} children of a themed window")
+            self._close(children)
+
+    def bench_exclusion(self) -> None:
+        washi = self.washi
+        mw = self.aqt.mw
+        from PyQt6.QtWidgets import QLabel, QLineEdit, QVBoxLayout, QWidget
+
+        central = QWidget()
+        layout = QVBoxLayout(central)
+        heavy = QLabel("heavy")
+        custom = QLineEdit()
+        custom_css = "QLineEdit { color: red; }"
+        custom.setStyleSheet(custom_css)
+        layout.addWidget(heavy)
+        layout.addWidget(custom)
+        mw.setCentralWidget(central)
+        manager = washi.theme_manager_instance
+        menubar_css = manager.section_css('menu_bar')
+
+        def exclude() -> None:
+            washi.exclude_from_theme(heavy)
+            manager.style_widget(mw)  # 与定时对话框扫描相同
+            self._process_events()
+
+        def include() -> None:
+            washi.exclude_from_theme(heavy, False)
+            self._process_events()
+
+        self.run("exclude_in_main_window", exclude, setup=include)
+        if mw.form.menubar.styleSheet() != menubar_css:
+            self.failures.append("excluding a widget in mw replaced the menubar sheet")
+        if custom.styleSheet() != custom_css:
+            self.failures.append("excluding a widget in mw replaced a sibling's own sheet")
+        if manager._is_washi_sheet(heavy.styleSheet()) or manager._is_washi_sheet(mw.styleSheet()):
+            self.failures.append("excluded widget still receives the washi sheet")
+        include()
+        mw.setCentralWidget(QWidget())
+
+    def bench_windows(self) -> None:
+        washi = self.washi
+        manager = washi.theme_manager_instance
+        theme = self.aqt.theme.theme_manager
+        for count in WINDOW_COUNTS:
+            windows = self._windows(count)
+            for window in windows:
+                manager.style_widget(window)
+            self._process_events()
+
+            def refresh() -> None:
+                manager.refresh_all()
+                self._process_events()
+
+            def toggle() -> None:
+                theme.night_mode = not theme.night_mode
+                self.aqt.gui_hooks.theme_did_change()
+                self._process_events()
+
+            def scan() -> None:
+                washi.style_dialog_widgets()
+                self._process_events()
+
+            self.run(f"refresh_all/{count}", refresh)
+            self.run(f"theme_toggle/{count}", toggle)
+            self.run(f"style_dialog_widgets/{count}", scan)
+            theme.night_mode = False
+            self._close(windows)
+
+    def run_all(self) -> dict:
+        self.bench_css_generation()
+        self.bench_webview()
+        if self.app is None:
+            print("PyQt6 not available; skipping widget benchmarks")
+        else:
+            self.bench_style_widget()
+            self.bench_batch()
+            self.bench_exclusion()
+            self.bench_windows()
+        return {
+            "meta": {
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "qt": bool(self.app),
+                "repeats": self.repeats,
+            },
+            "results": self.results,
+            "failures": self.failures,
+        }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """返回超出阈值的回退列表"""
+    overrides = baseline.get("thresholds", {})
+    regressions = []
+    for name, base in baseline["results"].items():
+        now = current["results"].get(name)
+        if now is None:
+            continue
+        limit = overrides.get(name, threshold)
+        delta = now["median_ms"] - base["median_ms"]
+        if delta > MIN_DELTA_MS and now["median_ms"] > base["median_ms"] * (1 + limit):
+            regressions.append(
+                f"{name}: {base['median_ms']:.3f} ms -> {now['median_ms']:.3f} ms "
+                f"(+{delta / base['median_ms'] * 100:.0f}%, limit {limit * 100:.0f}%)"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeats", type=int, default=15)
+    parser.add_argument("--save", type=Path, help="write results as a JSON baseline")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative slowdown before failing (default 0.25)")
+    args = parser.parse_args()
+
+    current = Suite(args.repeats).run_all()
+    for failure in current["failures"]:
+        print(f"FAIL {failure}")
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        print(f"baseline written to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(current, baseline, args.threshold)
+        print(f"compared with {args.compare} ({baseline['meta'].get('commit', '?')})")
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 1 if current["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())